@@ -2,20 +2,64 @@
 Epuber - EPUB 生成器包
 """
 
-__version__ = "0.1.0"
+import importlib
+from typing import TYPE_CHECKING
 
-# 导入所有模块
-from .generator import EpubGenerator
-from .logging import Logger, get_logger, setup_logger
-from .parser import Parser
-from .processor import TextProcessor
-from .cover import Cover, make_cover
-from .schemas import Volume, Chapter
+__version__ = "0.1.0"
 
-# 可选导入（如果依赖不可用）
-try:
+if TYPE_CHECKING:
+    from .cover import Cover, make_cover
+    from .generator import EpubGenerator
+    from .logging import Logger, get_logger, setup_logger
+    from .parser import Parser
+    from .processor import TextProcessor
+    from .schemas import Chapter, Volume
     from .writer import Writer
-except ImportError:
-    Writer = None
 
-__all__ = ["EpubGenerator", "Volume", "Chapter", "Parser", "TextProcessor", "Writer", "Cover", "make_cover", "Logger", "get_logger", "setup_logger"]
+# 公开名称到所在模块的映射，首次访问时才导入（PEP 562），
+# 避免 import epuber 时就加载 tqdm、rich、PIL、lxml 等较重的依赖
+_LAZY_ATTRS = {
+    "EpubGenerator": ".generator",
+    "Volume": ".schemas",
+    "Chapter": ".schemas",
+    "Parser": ".parser",
+    "TextProcessor": ".processor",
+    "Writer": ".writer",
+    "Cover": ".cover",
+    "make_cover": ".cover",
+    "Logger": ".logging",
+    "get_logger": ".logging",
+    "setup_logger": ".logging",
+}
+
+
+def __getattr__(name: str):
+    module_name = _LAZY_ATTRS.get(name)
+    if module_name is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+    try:
+        value = getattr(importlib.import_module(module_name, __name__), name)
+    except ImportError:
+        # 可选组件（如果依赖不可用）
+        if name != "Writer":
+            raise
+        value = None
+
+    globals()[name] = value
+    return value
+
+
+__all__ = [
+    "EpubGenerator",
+    "Volume",
+    "Chapter",
+    "Parser",
+    "TextProcessor",
+    "Writer",
+    "Cover",
+    "make_cover",
+    "Logger",
+    "get_logger",
+    "setup_logger",
+]
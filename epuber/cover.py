@@ -3,9 +3,14 @@
 """
 
 import io
+import logging
+import threading
+from functools import lru_cache
 from pathlib import Path
+from typing import Optional
 
 try:
+    import PIL
     from PIL import Image, ImageDraw, ImageFont
 
     HAS_PIL = True
@@ -14,6 +19,49 @@ except ImportError:
 
 from .exceptions import EpubGenerationError
 
+# 候选字体路径，按优先级排列
+_FONT_PATHS = [
+    "/System/Library/Fonts/PingFang.ttc",  # macOS
+    "/System/Library/Fonts/STHeiti Light.ttc",  # macOS 备用
+    "C:/Windows/Fonts/msyh.ttc",  # Windows 微软雅黑
+    "C:/Windows/Fonts/simsun.ttc",  # Windows 宋体
+    "C:/Windows/Fonts/msyhbd.ttc",  # Windows 微软雅黑粗体
+    "C:/Windows/Fonts/simhei.ttf",  # Windows 黑体
+    "/usr/share/fonts/truetype/dejavu/DejaVuSans-Bold.ttf",  # Linux
+    "/usr/share/fonts/truetype/droid/DroidSansFallback.ttf",  # Linux 备用
+    "/usr/share/fonts/truetype/wqy/wqy-microhei.ttc",  # Linux 中文
+]
+
+# 首次查找后记住可用的字体路径（空字符串表示没有可用字体）
+_font_path: Optional[str] = None
+
+# make_cover 复用的封面生成器实例
+_cover: Optional["Cover"] = None
+_cover_lock = threading.Lock()
+
+
+def _find_font_path() -> str:
+    """查找第一个存在的字体文件，结果在进程内复用"""
+    global _font_path
+    if _font_path is None:
+        _font_path = next((p for p in _FONT_PATHS if Path(p).exists()), "")
+    return _font_path
+
+
+@lru_cache(maxsize=16)
+def _load_font(size: int):
+    """加载字体，按字号缓存"""
+    path = _find_font_path()
+    if path:
+        return ImageFont.truetype(path, size)
+    return ImageFont.load_default()
+
+
+@lru_cache(maxsize=1024)
+def _text_width(font, text: str) -> int:
+    """测量文字宽度，按（字体, 文本）缓存；字体对象在进程内复用，可直接作为键"""
+    return font.getbbox(text)[2]
+
 
 class Cover:
     """封面生成器"""
@@ -22,29 +70,12 @@ class Cover:
         if not HAS_PIL:
             raise EpubGenerationError("需要Pillow库: pip install Pillow")
 
+        # 记录实际加载的 PIL 构建（标准 Pillow 或 Pillow-SIMD）
+        logging.getLogger("epuber").debug(f"使用 PIL {PIL.__version__}: {Image.core.__file__}")
+
         self.w, self.h = 1400, 1800  # 尺寸
-        self.font_big = self._font(144)  # 大字体
-        self.font_small = self._font(36)  # 小字体
-
-    def _font(self, size):
-        """加载字体"""
-        paths = [
-            "/System/Library/Fonts/PingFang.ttc",  # macOS
-            "/System/Library/Fonts/STHeiti Light.ttc",  # macOS 备用
-            "C:/Windows/Fonts/msyh.ttc",  # Windows 微软雅黑
-            "C:/Windows/Fonts/simsun.ttc",  # Windows 宋体
-            "C:/Windows/Fonts/msyhbd.ttc",  # Windows 微软雅黑粗体
-            "C:/Windows/Fonts/simhei.ttf",  # Windows 黑体
-            "/usr/share/fonts/truetype/dejavu/DejaVuSans-Bold.ttf",  # Linux
-            "/usr/share/fonts/truetype/droid/DroidSansFallback.ttf",  # Linux 备用
-            "/usr/share/fonts/truetype/wqy/wqy-microhei.ttc",  # Linux 中文
-        ]
-
-        for p in paths:
-            if Path(p).exists():
-                return ImageFont.truetype(p, size)
-
-        return ImageFont.load_default()
+        self.font_big = _load_font(144)  # 大字体
+        self.font_small = _load_font(36)  # 小字体
 
     def make(self, title: str, author: str, style: str = "default") -> bytes:
         """生成封面
@@ -72,12 +103,12 @@ class Cover:
         draw = ImageDraw.Draw(img)
 
         # 标题位置
-        tw = self.font_big.getbbox(title)[2]
+        tw = _text_width(self.font_big, title)
         tx = (self.w - tw) // 2
         ty = self.h // 3
 
         # 作者位置
-        aw = self.font_small.getbbox(f"作者：{author}")[2]
+        aw = _text_width(self.font_small, f"作者：{author}")
         ax = self.w - aw - 50
         ay = self.h - 100
 
@@ -92,11 +123,11 @@ class Cover:
         img = self._gradient("#1a1a1a", "#4a4a4a")
         draw = ImageDraw.Draw(img)
 
-        tw = self.font_big.getbbox(title)[2]
+        tw = _text_width(self.font_big, title)
         tx = (self.w - tw) // 2
         ty = self.h // 3
 
-        aw = self.font_small.getbbox(f"作者：{author}")[2]
+        aw = _text_width(self.font_small, f"作者：{author}")
         ax = self.w - aw - 50
         ay = self.h - 100
 
@@ -117,11 +148,11 @@ class Cover:
             r = 60 - i * 10
             draw.ellipse([x - r, y - r, x + r, y + r], fill=colors[i], outline=colors[i])
 
-        tw = self.font_big.getbbox(title)[2]
+        tw = _text_width(self.font_big, title)
         tx = (self.w - tw) // 2
         ty = self.h // 3
 
-        aw = self.font_small.getbbox(f"作者：{author}")[2]
+        aw = _text_width(self.font_small, f"作者：{author}")
         ax = self.w - aw - 50
         ay = self.h - 100
 
@@ -139,11 +170,11 @@ class Cover:
         draw.rectangle([0, 0, self.w - 1, self.h - 1], outline="#8b4513", width=8)
         draw.rectangle([40, 40, self.w - 40, self.h - 40], outline="#8b4513", width=2)
 
-        tw = self.font_big.getbbox(title)[2]
+        tw = _text_width(self.font_big, title)
         tx = (self.w - tw) // 2
         ty = self.h // 3
 
-        aw = self.font_small.getbbox(f"著者：{author}")[2]
+        aw = _text_width(self.font_small, f"著者：{author}")
         ax = self.w - aw - 50
         ay = self.h - 100
 
@@ -154,20 +185,17 @@ class Cover:
 
     def _gradient(self, c1: str, c2: str) -> Image.Image:
         """渐变背景"""
-        img = Image.new("RGB", (self.w, self.h))
         r1, g1, b1 = self._hex_rgb(c1)
         r2, g2, b2 = self._hex_rgb(c2)
 
+        # 每行颜色相同：只逐行计算一列像素，再横向拉伸到整幅宽度，避免逐像素 putpixel
+        column = bytearray()
         for y in range(self.h):
             f = y / self.h
-            r = int(r1 + (r2 - r1) * f)
-            g = int(g1 + (g2 - g1) * f)
-            b = int(b1 + (b2 - b1) * f)
-
-            for x in range(self.w):
-                img.putpixel((x, y), (r, g, b))
+            column += bytes((int(r1 + (r2 - r1) * f), int(g1 + (g2 - g1) * f), int(b1 + (b2 - b1) * f)))
 
-        return img
+        strip = Image.frombytes("RGB", (1, self.h), bytes(column))
+        return strip.resize((self.w, self.h), Image.Resampling.NEAREST)
 
     def _text_shadow(
         self, draw: ImageDraw.ImageDraw, text: str, pos: tuple, font, color: str = "white", shadow: str = "#34495e"
@@ -185,7 +213,8 @@ class Cover:
     def _png(self, img: Image.Image) -> bytes:
         """转PNG字节"""
         buf = io.BytesIO()
-        img.save(buf, format="PNG")
+        # 封面数据随即写入 EPUB，使用最快的 zlib 级别，体积略增但编码耗时明显减少
+        img.save(buf, format="PNG", compress_level=1)
         return buf.getvalue()
 
     @classmethod
@@ -196,6 +225,10 @@ class Cover:
 
 # 便捷函数
 def make_cover(title: str, author: str, style: str = "default") -> bytes:
-    """生成封面"""
-    c = Cover()
+    """生成封面（复用同一个生成器实例）"""
+    global _cover
+    with _cover_lock:
+        if _cover is None:
+            _cover = Cover()
+        c = _cover
     return c.make(title, author, style)
@@ -4,13 +4,14 @@ EPUB 生成器协调器，负责编排各个组件
 """
 
 from pathlib import Path
-from typing import Optional
+from typing import TYPE_CHECKING, Optional
 
 from .exceptions import EpubGenerationError
-from .logging import Logger
 from .parser import Parser
 from .processor import TextProcessor
-from tqdm import tqdm
+
+if TYPE_CHECKING:
+    from .logging import Logger
 
 # 可选导入writer
 try:
@@ -44,7 +45,7 @@ class EpubGenerator:
         language: str = "zh-CN",
         cover: Optional[Path] = None,
         cover_style: str = "default",
-        logger: Optional[Logger] = None,
+        logger: Optional["Logger"] = None,
         parser_config: Optional[dict] = None,
     ) -> None:
         """
@@ -61,6 +62,8 @@ class EpubGenerator:
             logger: 日志记录器
             parser_config: 解析器配置
         """
+        from tqdm import tqdm
+
         try:
             progress_enabled = logger is not None
 
@@ -72,8 +75,9 @@ class EpubGenerator:
             if logger:
                 logger.progress_complete(f"解析完成，发现 {len(volumes)} 个卷/章节")
 
-            # 2. 处理文本内容
-            total_chapters = sum(len(volume.chapters) for volume in volumes)
+            # 2. 处理文本内容（章节较多时由处理器并行转换）
+            chapters = [chapter for volume in volumes for chapter in volume.chapters]
+            total_chapters = len(chapters)
             if logger:
                 logger.progress_start("处理文本内容")
             with tqdm(
@@ -82,18 +86,25 @@ class EpubGenerator:
                 unit="章",
                 disable=not progress_enabled,
             ) as pbar:
-                for volume in volumes:
-                    for chapter in volume.chapters:
-                        chapter.content = self.processor.process_content(chapter.content)
-                        pbar.update(1)
-                        if logger and logger.verbose:
-                            logger.debug(f"已处理章节: {chapter.title}")
+                # 进度条按批推进，最多更新约500次
+                batch = max(1, total_chapters // 500)
+                pending = 0
+                contents = self.processor.process_many([chapter.content for chapter in chapters])
+                for chapter, content in zip(chapters, contents):
+                    chapter.content = content
+                    pending += 1
+                    if pending >= batch:
+                        pbar.update(pending)
+                        pending = 0
+                    if logger and logger.verbose:
+                        logger.debug(f"已处理章节: {chapter.title}")
+                pbar.update(pending)
             if logger:
                 logger.progress_complete(f"文本处理完成，共处理 {total_chapters} 个章节")
 
             # 3. 检查writer是否可用
             if self.writer is None:
-                raise EpubGenerationError("EPUB生成需要ebooklib库，请安装: pip install ebooklib")
+                raise EpubGenerationError("EPUB生成需要lxml库，请安装: pip install lxml")
 
             # 4. 生成 EPUB 文件
             if logger:
@@ -6,15 +6,13 @@ Epuber 日志模块
 import logging
 from typing import Optional
 
-from rich.console import Console
-from rich.logging import RichHandler
-from rich.text import Text
-
 
 class Logger:
     """统一日志管理器"""
 
     def __init__(self, verbose: bool = False):
+        from rich.console import Console
+
         self.verbose = verbose
         self.console = Console()
 
@@ -23,6 +21,8 @@ class Logger:
 
     def _setup_logging(self):
         """设置标准logging配置"""
+        from rich.logging import RichHandler
+
         # 创建logger
         logger = logging.getLogger("epuber")
         logger.setLevel(logging.DEBUG if self.verbose else logging.INFO)
@@ -60,30 +60,31 @@ class Logger:
 
     def success(self, message: str):
         """成功消息"""
-        text = Text(message, style="bold green")
-        self.console.print(text)
+        self._print(message, "bold green")
 
     def failure(self, message: str):
         """失败消息"""
-        text = Text(message, style="bold red")
-        self.console.print(text)
+        self._print(message, "bold red")
 
     def step(self, step_num: int, message: str):
         """步骤消息"""
-        text = Text(f"[{step_num}] {message}", style="cyan")
-        self.console.print(text)
+        self._print(f"[{step_num}] {message}", "cyan")
 
     def progress_start(self, message: str):
         """开始进度"""
         if self.verbose:
-            text = Text(f"开始: {message}", style="blue")
-            self.console.print(text)
+            self._print(f"开始: {message}", "blue")
 
     def progress_complete(self, message: str):
         """完成进度"""
         if self.verbose:
-            text = Text(f"完成: {message}", style="green")
-            self.console.print(text)
+            self._print(f"完成: {message}", "green")
+
+    def _print(self, message: str, style: str):
+        """按样式输出纯文本（不解析markup）"""
+        from rich.text import Text
+
+        self.console.print(Text(message, style=style))
 
 
 # 全局logger实例
@@ -0,0 +1,33 @@
+"""
+Epuber EPUB 元数据与生成配置模型
+面向用户输入，使用 Pydantic 校验
+"""
+
+from typing import List, Optional
+
+from pydantic import BaseModel, Field
+
+from .schemas import Volume
+
+
+class EpubMetadata(BaseModel):
+    """EPUB 元数据模型"""
+
+    title: str = Field(..., description="书籍标题")
+    author: str = Field(..., description="作者姓名")
+    language: str = Field("zh-CN", description="语言代码")
+    identifier: Optional[str] = Field(None, description="书籍标识符")
+    description: Optional[str] = Field(None, description="书籍描述")
+    publisher: Optional[str] = Field(None, description="出版商")
+    date: Optional[str] = Field(None, description="出版日期")
+    rights: Optional[str] = Field(None, description="版权信息")
+
+
+class EpubConfig(BaseModel):
+    """EPUB 生成配置模型"""
+
+    metadata: EpubMetadata = Field(..., description="EPUB 元数据")
+    volumes: List[Volume] = Field(default_factory=list, description="卷列表")
+    cover_image: Optional[str] = Field(None, description="封面图片路径")
+    css_template: Optional[str] = Field(None, description="CSS 模板路径")
+    output_format: str = Field("epub", description="输出格式")
@@ -9,16 +9,84 @@ Epuber 解析器模块
 正则表达式可自定义，提供默认配置
 """
 
+import codecs
+import os
 import re
+from concurrent.futures import ProcessPoolExecutor
 from pathlib import Path
-from typing import Any, Dict, List, Optional
+from typing import Any, Dict, List, Optional, Tuple, Union
 
-import chardet
-from tqdm import tqdm
+# 可选导入 charset-normalizer（检测速度明显快于 chardet）
+try:
+    from charset_normalizer import from_bytes
+except ImportError:
+    from_bytes = None
 
 from .exceptions import FileParseError
 from .schemas import Chapter, Volume
 
+# 字符集检测只采样文件开头部分，足以判断编码
+_DETECT_SAMPLE_SIZE = 64 * 1024
+
+# 可以写成局部内联形式的编译标志
+_INLINE_FLAGS = ((re.ASCII, "a"), (re.IGNORECASE, "i"), (re.MULTILINE, "m"), (re.DOTALL, "s"), (re.VERBOSE, "x"))
+
+# 表达式开头的全局内联标志，如 (?i)；合并到分支中时需要改写为局部标志
+_GLOBAL_FLAGS_RE = re.compile(r"^(?:\(\?[aiLmsux]+\))+")
+
+# 字节序标记及对应编码（UTF-32 的 BOM 以 UTF-16 的 BOM 开头，需先判断）
+_BOM_ENCODINGS = (
+    (codecs.BOM_UTF8, "utf-8-sig"),
+    (codecs.BOM_UTF32_LE, "utf-32"),
+    (codecs.BOM_UTF32_BE, "utf-32"),
+    (codecs.BOM_UTF16_LE, "utf-16"),
+    (codecs.BOM_UTF16_BE, "utf-16"),
+)
+
+# 有卷模式下单独作为第一层级的内容类型
+_SPECIAL_CONTENT_TYPES = frozenset(("extra", "postscript", "notice"))
+
+# 可能是标题的行：不以 ASCII 空白字符开头，去除首尾空白后非空且不超过30个字符
+# （负向前瞻：首个非空白字符起第30个字符之后不能再出现非空白字符）
+_CANDIDATE_LINE_RE = re.compile(r"^(?![ \t\n\r\v\f])[^\S\n]*(?=\S)(?![^\n]{30}[^\S\n]*\S)[^\n]*", re.MULTILINE)
+
+
+def _pattern_source(pattern: re.Pattern) -> str:
+    """获取可以嵌入分支表达式的正则表达式源码
+
+    开头的全局内联标志和编译标志统一转为局部内联标志，合并后不影响其他分支
+
+    Args:
+        pattern: 已编译的表达式
+
+    Returns:
+        正则表达式源码
+    """
+    source = _GLOBAL_FLAGS_RE.sub("", pattern.pattern)
+    inline = "".join(flag for value, flag in _INLINE_FLAGS if pattern.flags & value)
+    if not inline:
+        return source
+    # 详细模式下 # 注释会延续到行尾，右括号需要另起一行
+    return f"(?{inline}:{source}\n)" if pattern.flags & re.VERBOSE else f"(?{inline}:{source})"
+
+
+def _compile_pattern(pattern: Union[str, re.Pattern], flags: int = 0) -> re.Pattern:
+    """编译单个正则表达式，已编译的表达式保留原有标志
+
+    Args:
+        pattern: 正则表达式字符串或已编译的表达式
+        flags: 额外的编译标志
+
+    Returns:
+        编译后的正则表达式
+
+    Raises:
+        re.error: 正则表达式语法错误
+    """
+    if isinstance(pattern, re.Pattern):
+        return re.compile(pattern.pattern, pattern.flags | flags) if flags else pattern
+    return re.compile(pattern, flags)
+
 
 class Parser:
     """小说文件解析器"""
@@ -33,6 +101,81 @@ class Parser:
         if config:
             self.config.update(config)
 
+        # 预编译正则表达式：每一类规则尽量合并为一个分支表达式，每行只需匹配一次
+        self._volume_patterns = self._compile_patterns(self.config["volume_patterns"])
+        self._chapter_patterns = self._compile_patterns(self.config["chapter_patterns"])
+        self._exclude_patterns = self._compile_patterns(self.config["exclude_patterns"], re.IGNORECASE)
+        # 清洗规则依次替换，后面的规则作用于前面规则替换后的结果，不能合并
+        self._clean_patterns = tuple(_compile_pattern(p) for p in self.config.get("title_clean_patterns", []))
+
+        # 内容类型关键词预先转换为小写，检测时无需对每个关键词重复转换
+        self._content_keywords = tuple(
+            (content_type, tuple(keyword.lower() for keyword in keywords))
+            for content_type, keywords in self.config["content_keywords"].items()
+        )
+
+        # 默认清洗规则只可能匹配含有这些括号的标题；自定义规则时不做快速判断
+        self._clean_triggers = None
+        if not config or "title_clean_patterns" not in config:
+            self._clean_triggers = frozenset("【『〔（([")
+
+        # 按 排除 -> 卷 -> 章 的优先级依次判断
+        self._line_classes = (
+            ("excl", self._exclude_patterns),
+            ("vol", self._volume_patterns),
+            ("chap", self._chapter_patterns),
+        )
+        self._line_re = self._fuse_line_classes(self._line_classes)
+
+    @staticmethod
+    def _fuse_line_classes(line_classes: Tuple[Tuple[str, Tuple[re.Pattern, ...]], ...]) -> Optional[re.Pattern]:
+        """将各类规则融合为一个表达式，每行只需匹配一次
+
+        每个分支前的 .*? 保持与 re.search 相同的匹配语义，匹配到的分组名即为类别。
+        用户表达式含有分组时，融合后分组编号会整体后移（反向引用失效），分组名也可能与
+        类别名冲突，这时不融合
+
+        Args:
+            line_classes: (类别名, 编译后的表达式元组) 列表，按优先级排列
+
+        Returns:
+            融合后的表达式；无法安全融合时返回 None
+        """
+        branches = []
+        for name, patterns in line_classes:
+            if len(patterns) > 1 or any(pattern.groups for pattern in patterns):
+                return None
+            branches.append(f"(?P<{name}>.*?(?:{_pattern_source(patterns[0]) if patterns else '(?!)'}))")
+        try:
+            return re.compile("|".join(branches))
+        except re.error:
+            return None
+
+    @staticmethod
+    def _compile_patterns(patterns: List[Union[str, re.Pattern]], flags: int = 0) -> Tuple[re.Pattern, ...]:
+        """编译一组正则表达式，能安全合并时合并为一个分支表达式
+
+        每个表达式先单独编译，语法错误在这里直接抛出。含有分组的表达式合并后
+        分组编号会改变，分组名也可能重复，这时保留为逐个匹配的列表
+
+        Args:
+            patterns: 正则表达式列表，元素可以是字符串或已编译的表达式
+            flags: 编译标志
+
+        Returns:
+            编译后的正则表达式元组，任意一个匹配即视为匹配；列表为空时返回空元组
+
+        Raises:
+            re.error: 正则表达式语法错误
+        """
+        compiled = tuple(_compile_pattern(pattern, flags) for pattern in patterns)
+        if len(compiled) < 2 or any(pattern.groups for pattern in compiled):
+            return compiled
+        try:
+            return (re.compile("|".join(f"(?:{_pattern_source(pattern)})" for pattern in compiled)),)
+        except re.error:
+            return compiled
+
     def _get_default_config(self) -> Dict[str, Any]:
         """【修改】获取默认配置：添加标题清洗正则"""
         return {
@@ -110,11 +253,14 @@ class Parser:
     def _clean_title(self, title: str) -> str:
         """【新增】清洗标题，只移除干扰信息，保留原有标题结构和数字"""
 
-        # 1. 移除配置中定义的干扰模式（现在是通用括号）
+        # 标题不含任何括号时无需清洗
+        if self._clean_triggers is not None and self._clean_triggers.isdisjoint(title):
+            return title.strip()
+
+        # 1. 依次移除配置中定义的干扰模式（现在是通用括号）
         cleaned_title = title.strip()
-        for pattern in self.config.get("title_clean_patterns", []):
-            # 使用 re.sub 替换匹配到的模式为空字符串
-            cleaned_title = re.sub(pattern, "", cleaned_title)
+        for pattern in self._clean_patterns:
+            cleaned_title = pattern.sub("", cleaned_title)
 
         # 2. 保证不进行任何去除数字和分隔符的操作
         return cleaned_title.strip()
@@ -132,11 +278,11 @@ class Parser:
             # 读取文件内容，支持多种字符集
             content = self._read_file_content(file_path)
 
-            # 分割章节
-            chapters = self._split_chapters(content, show_progress=show_progress)
+            # 分割章节，同时得知是否出现卷标题
+            chapters, has_volumes = self._split_chapters(content, show_progress=show_progress)
 
             # 根据是否有卷采用不同策略
-            if self._has_volumes(chapters):
+            if has_volumes:
                 return self._create_volume_structure(chapters)
             else:
                 return self._create_flat_structure(chapters)
@@ -147,6 +293,22 @@ class Parser:
         except Exception as e:
             raise FileParseError(f"解析文件失败: {file_path}") from e
 
+    def parse_many(self, file_paths: List[Path]) -> List[List[Volume]]:
+        """批量解析多个小说文件，文件多于一个且有多个 CPU 时使用进程池并行解析
+
+        Args:
+            file_paths: 小说文件路径列表
+
+        Returns:
+            与输入顺序一致的卷列表
+        """
+        workers = min(os.cpu_count() or 1, len(file_paths))
+        if workers < 2:
+            return [self.parse(file_path) for file_path in file_paths]
+
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            return list(pool.map(self.parse, file_paths))
+
     def _read_file_content(self, file_path: Path) -> str:
         """读取文件内容，支持多种字符集自动检测
 
@@ -160,35 +322,33 @@ class Parser:
             FileParseError: 当所有编码都无法解码时
         """
 
-        with open(file_path, "rb") as f:
-            raw_data = f.read()
+        raw_data = file_path.read_bytes()
 
-        # 使用chardet检测字符集
-        detected = chardet.detect(raw_data)
-        confidence = detected.get("confidence", 0)
-        encoding = detected.get("encoding")
+        # 带 BOM 的文件直接按 BOM 对应的编码解码，无需检测
+        for bom, encoding in _BOM_ENCODINGS:
+            if raw_data.startswith(bom):
+                try:
+                    return raw_data.decode(encoding)
+                except UnicodeDecodeError:
+                    break
 
-        # 如果检测到编码且置信度足够高
-        if encoding and confidence > 0.7:
+        # 大多数文件是 UTF-8，直接尝试解码，失败时才进行字符集检测
+        try:
+            return raw_data.decode("utf-8")
+        except UnicodeDecodeError:
+            pass
+
+        encoding = self._detect_encoding(raw_data)
+        if encoding:
             try:
-                # 特殊处理UTF-8 BOM
-                if raw_data.startswith(b"\xef\xbb\xbf") and encoding.lower() == "utf-8":
-                    return raw_data.decode("utf-8-sig")
-                else:
-                    return raw_data.decode(encoding)
+                return raw_data.decode(encoding)
             except (UnicodeDecodeError, LookupError):
                 pass
 
-        # Fallback: 尝试常见中文编码
-        fallback_encodings = ["utf-8", "gbk", "gb2312", "big5", "utf-16"]
-
-        for enc in fallback_encodings:
+        # Fallback: 尝试常见中文编码（UTF-8 已经尝试过；GBK 是 GB2312 的超集）
+        for enc in ("gbk", "big5", "utf-16"):
             try:
-                # 检查UTF-8 BOM
-                if raw_data.startswith(b"\xef\xbb\xbf") and enc == "utf-8":
-                    return raw_data.decode("utf-8-sig")
-                else:
-                    return raw_data.decode(enc)
+                return raw_data.decode(enc)
             except (UnicodeDecodeError, LookupError):
                 continue
 
@@ -198,119 +358,138 @@ class Parser:
         except Exception:
             raise FileParseError(f"无法解码文件内容: {file_path}。文件可能已损坏或使用了不支持的编码。")
 
-    def _split_chapters(self, content: str, show_progress: bool = False) -> List[Dict[str, Any]]:
-        """【修改】将小说内容按章节分割，并对标题进行清洗"""
-        lines = content.split("\n")
-        iterator = tqdm(lines, desc="解析章节", unit="行", disable=not show_progress) if show_progress else lines
+    def _detect_encoding(self, data: bytes) -> Optional[str]:
+        """检测字符集，优先使用 charset-normalizer，不可用时回退到 chardet
+
+        Args:
+            data: 待检测的完整字节数据
+
+        Returns:
+            检测到的编码名称，无法可靠判断时返回 None
+        """
+        if from_bytes is not None:
+            # charset-normalizer 自行分块采样；手动截断可能切断多字节字符导致误判
+            best = from_bytes(data).best()
+            return best.encoding if best else None
+
+        import chardet
+
+        # chardet 只对文件开头采样，置信度足够高时才采用
+        detected = chardet.detect(data[:_DETECT_SAMPLE_SIZE])
+        if detected.get("confidence", 0) > 0.7:
+            return detected.get("encoding")
+        return None
+
+    def _split_chapters(self, content: str, show_progress: bool = False) -> Tuple[List[Dict[str, Any]], bool]:
+        """【修改】将小说内容按章节分割，并对标题进行清洗
+
+        直接在整个文本上用 finditer 扫描可能的标题行，章节内容按偏移量切片，
+        不再生成逐行列表
+
+        Returns:
+            (章节数据列表, 是否包含卷标题)
+        """
+        pbar = None
+        if show_progress:
+            from tqdm import tqdm
+
+            pbar = tqdm(total=len(content), desc="解析章节", unit="字", mininterval=0.1)
+        # 进度条按批推进，整个文件最多更新约500次
+        batch = max(1, len(content) // 500)
         chapters = []
+        has_volumes = False
         current_title = None
-        current_content = []
+        current_is_volume = False
+        body_start = 0
+        scanned = 0
 
-        for line in iterator:
-            line_stripped = line.strip()
+        for candidate in _CANDIDATE_LINE_RE.finditer(content):
+            if pbar is not None and candidate.end() - scanned >= batch:
+                pbar.update(candidate.end() - scanned)
+                scanned = candidate.end()
 
             # 按照优先级顺序检查：排除模式 -> 一级目录模式 -> 二级目录模式
-            # 如果是排除行，则跳过，不作为标题处理
-            # 注意：检测方法现在期望原始行内容（包含可能的行首空白）
-            if not self._is_exclude_line(line) and (self._is_volume_title(line) or self._is_chapter_title(line)):
-                # 保存之前的章节
-                if current_title is not None:
-                    chapter_data = self._create_chapter_data(
-                        title=current_title, content="\n".join(current_content).strip()
-                    )
-                    if chapter_data["content"]:  # 只添加有内容的章节
-                        chapters.append(chapter_data)
+            # 排除行作为正文处理
+            line = candidate.group()
+            kind = self._classify_line(line)
+            if kind is None or kind == "excl":
+                continue
 
-                # 开始新章节
-                current_title = self._clean_title(line_stripped)
+            # 保存之前的章节
+            if current_title is not None:
+                chapter_data = self._create_chapter_data(
+                    title=current_title,
+                    content=content[body_start : candidate.start()].strip(),
+                    is_volume=current_is_volume,
+                )
+                if chapter_data["content"]:  # 只添加有内容的章节
+                    chapters.append(chapter_data)
+                    has_volumes = has_volumes or chapter_data["is_volume"]
 
-                # 如果清洗后标题为空，保留原行，避免流程被改变
-                if not current_title:
-                    current_content.append(line)
-                    current_title = None
-                    continue
+            # 开始新章节；如果清洗后标题为空，则丢弃到下一个标题之前的内容
+            current_title = self._clean_title(line.strip()) or None
+            current_is_volume = kind == "vol"
+            body_start = candidate.end() + 1
 
-                current_content = []
-            else:
-                # 累积内容
-                current_content.append(line)
+        if pbar is not None:
+            pbar.update(len(content) - scanned)
+            pbar.close()
 
         # 添加最后一个章节
         if current_title is not None:
-            chapter_data = self._create_chapter_data(title=current_title, content="\n".join(current_content).strip())
+            chapter_data = self._create_chapter_data(
+                title=current_title, content=content[body_start:].strip(), is_volume=current_is_volume
+            )
             if chapter_data["content"]:
                 chapters.append(chapter_data)
+                has_volumes = has_volumes or chapter_data["is_volume"]
 
         # 如果没有找到任何章节标题，抛出异常（设计文档要求）
         if not chapters:
             raise FileParseError("未能在文件中找到任何章节。请检查文件内容或正则表达式配置。")
 
-        return chapters
+        return chapters, has_volumes
+
+    def _classify_line(self, line: str) -> Optional[str]:
+        """按 排除 -> 卷 -> 章 的优先级判断候选标题行的类别
 
-    def _create_chapter_data(self, title: str, content: str) -> Dict[str, Any]:
-        """创建章节数据"""
-        # 原始逻辑，未修改
+        Args:
+            line: 候选标题行
+
+        Returns:
+            "excl"、"vol" 或 "chap"；都不匹配时返回 None
+        """
+        if self._line_re is not None:
+            match = self._line_re.match(line)
+            return match.lastgroup if match else None
+
+        for name, patterns in self._line_classes:
+            if any(pattern.search(line) for pattern in patterns):
+                return name
+        return None
+
+    def _create_chapter_data(self, title: str, content: str, is_volume: bool) -> Dict[str, Any]:
+        """创建章节数据
+
+        Args:
+            title: 清洗后的标题
+            content: 章节内容
+            is_volume: 标题行是否按卷标题匹配（分割时已判定，无需重新匹配）
+        """
         return {
             "title": title,
             "content": content,
             "type": self._detect_content_type(title),
-            "is_volume": self._is_volume_title(title),
+            "is_volume": is_volume,
         }
 
-    def _is_volume_title(self, line: str) -> bool:
-        """检测是否为卷标题"""
-        # 标题长度限制：最长30个字符
-        if len(line.strip()) > 30:
-            return False
-
-        # 标题必须从行首开始，不以空白字符开头
-        if line.startswith((" ", "\t", "\n", "\r", "\v", "\f")):
-            return False
-
-        for pattern in self.config["volume_patterns"]:
-            if re.search(pattern, line):
-                return True
-        return False
-
-    def _is_exclude_line(self, line: str) -> bool:
-        """检测是否为应排除的行（优先级最高）"""
-        # 排除行也需要长度检查，避免误判过长的行
-        if len(line.strip()) > 50:  # 排除行可以稍微长一些
-            return False
-
-        # 排除行必须从行首开始，不以空白字符开头
-        if line.startswith((" ", "\t", "\n", "\r", "\v", "\f")):
-            return False
-
-        for pattern in self.config["exclude_patterns"]:
-            if re.search(pattern, line, re.IGNORECASE):
-                return True
-        return False
-
-    def _is_chapter_title(self, line: str) -> bool:
-        """检测是否为章节标题"""
-        # 标题长度限制：最长30个字符
-        if len(line.strip()) > 30:
-            return False
-
-        # 标题必须从行首开始，不以空白字符开头
-        if line.startswith((" ", "\t", "\n", "\r", "\v", "\f")):
-            return False
-
-        # 只使用正则表达式匹配，避免关键词匹配导致的误判
-        for pattern in self.config["chapter_patterns"]:
-            if re.search(pattern, line):
-                return True
-
-        return False
-
     def _detect_content_type(self, title: str) -> str:
         """检测内容类型"""
         title_lower = title.lower()
 
         # 检查关键词
-        for content_type, keywords in self.config["content_keywords"].items():
-            if any(keyword.lower() in title_lower for keyword in keywords):
+        for content_type, keywords in self._content_keywords:
+            if any(keyword in title_lower for keyword in keywords):
                 return content_type
 
         # 检查特殊单字
@@ -320,26 +499,6 @@ class Parser:
 
         return "chapter"
 
-    def _has_volumes(self, chapters: List[Dict[str, Any]]) -> bool:
-        """检查是否有卷标题"""
-        # 原始逻辑，未修改
-        return any(chapter["is_volume"] for chapter in chapters)
-
-    def _create_flat_structure(self, chapters: List[Dict[str, Any]]) -> List[Volume]:
-        """创建扁平结构（无卷时）"""
-        volumes = []
-
-        for chapter_data in chapters:
-            chapter = Chapter(
-                title=chapter_data["title"], content=chapter_data["content"], content_type=chapter_data["type"]
-            )
-
-            # 每个章节都作为独立的Volume（第一层级）
-            volume = Volume(title=chapter.title, chapters=[chapter])
-            volumes.append(volume)
-
-        return volumes
-
     def _create_volume_structure(self, chapters: List[Dict[str, Any]]) -> List[Volume]:
         """创建卷结构（有卷时）"""
         volumes = []
@@ -357,7 +516,7 @@ class Parser:
                 )
                 current_volume.chapters.append(volume_chapter)
 
-            elif chapter_data["type"] in ["extra", "postscript", "notice"]:
+            elif chapter_data["type"] in _SPECIAL_CONTENT_TYPES:
                 # 特殊内容直接作为第一层级
                 special_chapter = Chapter(
                     title=chapter_data["title"], content=chapter_data["content"], content_type=chapter_data["type"]
@@ -375,22 +534,13 @@ class Parser:
 
         return volumes
 
-    def _has_volumes(self, chapters: List[Dict[str, Any]]) -> bool:
-        """检查是否有卷标题"""
-        for chapter_data in chapters:
-            if chapter_data["is_volume"]:
-                return True
-        return False
-
     def _create_flat_structure(self, chapters: List[Dict[str, Any]]) -> List[Volume]:
         """创建扁平结构（无卷时，所有章节作为第一层级内容）"""
-        # 创建一个大的"内容"容器，包含所有章节
-        all_chapters = []
-        for chapter_data in chapters:
-            chapter = Chapter(
-                title=chapter_data["title"], content=chapter_data["content"], content_type=chapter_data["type"]
-            )
-            all_chapters.append(chapter)
+        # 创建一个大的"内容"容器，包含所有章节（章节数已知，直接用列表推导式一次构建）
+        all_chapters = [
+            Chapter(title=chapter_data["title"], content=chapter_data["content"], content_type=chapter_data["type"])
+            for chapter_data in chapters
+        ]
 
         # 返回一个包含所有章节的Volume，标题为None表示这是内容容器
         return [Volume(title=None, chapters=all_chapters)]
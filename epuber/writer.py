@@ -3,14 +3,261 @@ Epuber 写入器模块
 负责EPUB文件的生成和输出
 """
 
+import hashlib
+import mmap
+import zipfile
+from datetime import datetime, timezone
+from functools import lru_cache
 from pathlib import Path
-from typing import List, Optional
+from typing import TYPE_CHECKING, List, Optional, Tuple, Union
+
+from lxml import etree
+
+from .processor import escape_html
+
+if TYPE_CHECKING:
+    from .cover import Cover
+    from .schemas import Volume
+
+# 命名空间
+OPF_NS = "http://www.idpf.org/2007/opf"
+DC_NS = "http://purl.org/dc/elements/1.1/"
+NCX_NS = "http://www.daisy.org/z3986/2005/ncx/"
+XHTML_NS = "http://www.w3.org/1999/xhtml"
+EPUB_NS = "http://www.idpf.org/2007/ops"
+XML_NS = "http://www.w3.org/XML/1998/namespace"
+
+# 容器文件，指向包文档
+_CONTAINER_XML = """<?xml version="1.0" encoding="utf-8"?>
+<container xmlns="urn:oasis:names:tc:opendocument:xmlns:container" version="1.0">
+  <rootfiles>
+    <rootfile media-type="application/oebps-package+xml" full-path="EPUB/content.opf"/>
+  </rootfiles>
+</container>
+"""
 
-from ebooklib import epub
-from tqdm import tqdm
+# 正文页面的固定片段，按字节预先编码，页面直接拼接后写入 ZIP
+_XHTML_PREAMBLE = (
+    '<?xml version="1.0" encoding="utf-8"?>\n<!DOCTYPE html>\n'
+    '<html xmlns="http://www.w3.org/1999/xhtml" xmlns:epub="http://www.idpf.org/2007/ops" lang="{lang}" xml:lang="{lang}">'
+    "\n<head>\n<title>"
+)
+_XHTML_SUFFIX = b"</body>\n</html>\n"
+
+# 图片扩展名对应的 MIME 类型
+_IMAGE_MIME_TYPES = {
+    ".jpg": "image/jpeg",
+    ".jpeg": "image/jpeg",
+    ".png": "image/png",
+    ".gif": "image/gif",
+    ".webp": "image/webp",
+}
+
+# XHTML/CSS/OPF 等文本条目的 deflate 压缩级别
+_COMPRESS_LEVEL = 1
+
+_STYLESHEET_HREF = "style/default.css"
+_HEAD_END = b"</title>\n</head>\n<body>"
+_HEAD_END_WITH_STYLESHEET = (
+    f'</title>\n<link href="{_STYLESHEET_HREF}" rel="stylesheet" type="text/css"/>\n</head>\n<body>'
+).encode()
+
+
+@lru_cache(maxsize=8)
+def _load_template(path: Path) -> Optional[bytes]:
+    """读取模板文件，同一进程内生成多本书时只读取一次
+
+    Args:
+        path: 模板文件路径
+
+    Returns:
+        文件内容，文件不存在时返回 None
+    """
+    try:
+        return path.read_bytes()
+    except FileNotFoundError:
+        return None
+
+
+def _book_identifier(title: str, author: str) -> str:
+    """根据标题和作者生成书籍标识符
+
+    标识符只由标题和作者决定，相同输入总是得到相同的纯 ASCII 标识符
+
+    Args:
+        title: 书籍标题
+        author: 作者姓名
+
+    Returns:
+        书籍标识符
+    """
+    digest = hashlib.blake2b(f"{title}|{author}".encode(), digest_size=12).hexdigest()
+    return f"epuber-{digest}"
+
+
+class _StreamingEpubWriter:
+    """流式 EPUB 写入器
+
+    每个页面生成后立即写入 ZIP，只保留清单、阅读顺序和目录所需的少量信息，
+    全部内容写完后再生成 content.opf、toc.ncx 和 nav.xhtml
+    """
+
+    def __init__(self, zf: zipfile.ZipFile, language: str):
+        self.zf = zf
+        self.language = language
+        self.stylesheet = False
+        self.cover_image_id: Optional[str] = None
+        self.manifest: List[Tuple[str, str, str, Optional[str]]] = []  # (id, href, media-type, properties)
+        self.spine: List[str] = []
+        self.toc: List[Tuple[str, str, str]] = []  # (id, href, 标题)
+        self._preamble = _XHTML_PREAMBLE.format(lang=escape_html(language)).encode("utf-8")
+
+        # mimetype 必须是第一个文件，且不压缩
+        zf.writestr(zipfile.ZipInfo("mimetype"), "application/epub+zip", compress_type=zipfile.ZIP_STORED)
+        zf.writestr("META-INF/container.xml", _CONTAINER_XML)
+
+    def add_item(
+        self,
+        item_id: str,
+        href: str,
+        media_type: str,
+        content: Union[bytes, memoryview],
+        properties: Optional[str] = None,
+    ) -> None:
+        """写入一个资源文件并登记到清单
+
+        图片（JPEG/PNG/GIF/WebP）本身已经压缩，直接存储，避免再做一遍无效的 deflate
+        """
+        compress_type = zipfile.ZIP_STORED if media_type.startswith("image/") else zipfile.ZIP_DEFLATED
+        self.zf.writestr(f"EPUB/{href}", content, compress_type=compress_type)
+        self.manifest.append((item_id, href, media_type, properties))
 
-from .cover import Cover
-from .schemas import Volume
+    def add_page(
+        self, item_id: str, href: str, title: str, body: str = "", heading: bool = True, in_toc: bool = True
+    ) -> None:
+        """写入一个 XHTML 页面，并加入阅读顺序（可选加入目录）
+
+        页面由预先编码的固定片段和标题、正文的字节直接拼接，正文只编码一次，
+        不再先拼出完整的页面字符串
+
+        Args:
+            item_id: 清单中的标识
+            href: 文件名
+            title: 页面标题（纯文本）
+            body: 页面正文（XHTML 片段）
+            heading: 是否在正文前加上 <h1> 标题
+            in_toc: 是否加入目录
+        """
+        title_bytes = escape_html(title).encode("utf-8")
+        parts = [self._preamble, title_bytes, _HEAD_END_WITH_STYLESHEET if self.stylesheet else _HEAD_END]
+        if heading:
+            parts += (b"<h1>", title_bytes, b"</h1>\n" if body else b"</h1>")
+        if body:
+            parts.append(body.encode("utf-8"))
+        parts.append(_XHTML_SUFFIX)
+        self.add_item(item_id, href, "application/xhtml+xml", b"".join(parts))
+        self.spine.append(item_id)
+        if in_toc:
+            self.toc.append((item_id, href, title))
+
+    def finish(self, identifier: str, title: str, author: str, front: List[str]) -> None:
+        """写入导航文件和包文档
+
+        Args:
+            identifier: 书籍标识符
+            title: 书籍标题
+            author: 作者姓名
+            front: 排在目录页之前的页面标识（如封面页）
+        """
+        self.zf.writestr("EPUB/toc.ncx", self._build_ncx(identifier, title))
+        self.manifest.append(("ncx", "toc.ncx", "application/x-dtbncx+xml", None))
+        self.zf.writestr("EPUB/nav.xhtml", self._build_nav(title))
+        self.manifest.append(("nav", "nav.xhtml", "application/xhtml+xml", "nav"))
+
+        # 阅读顺序：封面 -> 目录 -> 正文
+        front_ids = set(front)
+        spine = front + ["nav"] + [item_id for item_id in self.spine if item_id not in front_ids]
+        self.zf.writestr("EPUB/content.opf", self._build_opf(identifier, title, author, spine))
+
+    def _build_opf(self, identifier: str, title: str, author: str, spine: List[str]) -> bytes:
+        """生成 content.opf"""
+        package = etree.Element(
+            f"{{{OPF_NS}}}package",
+            nsmap={None: OPF_NS},
+            attrib={"unique-identifier": "id", "version": "3.0"},
+        )
+        metadata = etree.SubElement(package, f"{{{OPF_NS}}}metadata", nsmap={"dc": DC_NS})
+        modified = etree.SubElement(metadata, f"{{{OPF_NS}}}meta", property="dcterms:modified")
+        modified.text = datetime.now(timezone.utc).strftime("%Y-%m-%dT%H:%M:%SZ")
+        if self.cover_image_id:
+            etree.SubElement(metadata, f"{{{OPF_NS}}}meta", name="cover", content=self.cover_image_id)
+        etree.SubElement(metadata, f"{{{DC_NS}}}identifier", id="id").text = identifier
+        etree.SubElement(metadata, f"{{{DC_NS}}}title").text = title
+        etree.SubElement(metadata, f"{{{DC_NS}}}language").text = self.language
+        etree.SubElement(metadata, f"{{{DC_NS}}}creator", id="creator").text = author
+
+        # 清单和阅读顺序条目数与章节数相同，循环内直接用预先拼好的标签名和属性字典
+        manifest = etree.SubElement(package, f"{{{OPF_NS}}}manifest")
+        item_tag = f"{{{OPF_NS}}}item"
+        for item_id, href, media_type, properties in self.manifest:
+            attrib = {"href": href, "id": item_id, "media-type": media_type}
+            if properties:
+                attrib["properties"] = properties
+            etree.SubElement(manifest, item_tag, attrib)
+
+        spine_el = etree.SubElement(package, f"{{{OPF_NS}}}spine", toc="ncx")
+        itemref_tag = f"{{{OPF_NS}}}itemref"
+        for item_id in spine:
+            etree.SubElement(spine_el, itemref_tag, {"idref": item_id})
+
+        return etree.tostring(package, xml_declaration=True, encoding="utf-8", pretty_print=True)
+
+    def _build_ncx(self, identifier: str, title: str) -> bytes:
+        """生成 toc.ncx（EPUB 2 兼容目录）"""
+        ncx = etree.Element(f"{{{NCX_NS}}}ncx", nsmap={None: NCX_NS}, version="2005-1")
+        head = etree.SubElement(ncx, f"{{{NCX_NS}}}head")
+        for name, content in (
+            ("dtb:uid", identifier),
+            ("dtb:depth", "1"),
+            ("dtb:totalPageCount", "0"),
+            ("dtb:maxPageNumber", "0"),
+        ):
+            etree.SubElement(head, f"{{{NCX_NS}}}meta", content=content, name=name)
+        doc_title = etree.SubElement(ncx, f"{{{NCX_NS}}}docTitle")
+        etree.SubElement(doc_title, f"{{{NCX_NS}}}text").text = title
+
+        nav_map = etree.SubElement(ncx, f"{{{NCX_NS}}}navMap")
+        nav_point_tag, nav_label_tag = f"{{{NCX_NS}}}navPoint", f"{{{NCX_NS}}}navLabel"
+        text_tag, content_tag = f"{{{NCX_NS}}}text", f"{{{NCX_NS}}}content"
+        for order, (item_id, href, label) in enumerate(self.toc, start=1):
+            nav_point = etree.SubElement(nav_map, nav_point_tag, {"id": item_id, "playOrder": str(order)})
+            etree.SubElement(etree.SubElement(nav_point, nav_label_tag), text_tag).text = label
+            etree.SubElement(nav_point, content_tag, {"src": href})
+
+        return etree.tostring(ncx, xml_declaration=True, encoding="utf-8", pretty_print=True)
+
+    def _build_nav(self, title: str) -> bytes:
+        """生成 nav.xhtml（EPUB 3 目录）"""
+        html = etree.Element(f"{{{XHTML_NS}}}html", nsmap={None: XHTML_NS, "epub": EPUB_NS})
+        html.set("lang", self.language)
+        html.set(f"{{{XML_NS}}}lang", self.language)
+        head = etree.SubElement(html, f"{{{XHTML_NS}}}head")
+        etree.SubElement(head, f"{{{XHTML_NS}}}title").text = title
+        if self.stylesheet:
+            etree.SubElement(head, f"{{{XHTML_NS}}}link", href=_STYLESHEET_HREF, rel="stylesheet", type="text/css")
+
+        body = etree.SubElement(html, f"{{{XHTML_NS}}}body")
+        nav = etree.SubElement(body, f"{{{XHTML_NS}}}nav", id="id", role="doc-toc")
+        nav.set(f"{{{EPUB_NS}}}type", "toc")
+        etree.SubElement(nav, f"{{{XHTML_NS}}}h2").text = title
+        ol = etree.SubElement(nav, f"{{{XHTML_NS}}}ol")
+        li_tag, a_tag = f"{{{XHTML_NS}}}li", f"{{{XHTML_NS}}}a"
+        for _, href, label in self.toc:
+            etree.SubElement(etree.SubElement(ol, li_tag), a_tag, {"href": href}).text = label
+
+        return etree.tostring(
+            html, xml_declaration=True, encoding="utf-8", doctype="<!DOCTYPE html>", pretty_print=True
+        )
 
 
 class Writer:
@@ -18,11 +265,22 @@ class Writer:
 
     def __init__(self):
         self.template_dir = Path(__file__).parent / "templates"
-        self.cover_gen = Cover() if Cover.available() else None
+        self._cover_gen: Optional["Cover"] = None
+        self._cover_checked = False
+
+    @property
+    def cover_gen(self) -> Optional["Cover"]:
+        """封面生成器，首次使用时才导入 PIL；不可用时为 None"""
+        if not self._cover_checked:
+            from .cover import Cover
+
+            self._cover_gen = Cover() if Cover.available() else None
+            self._cover_checked = True
+        return self._cover_gen
 
     def write_epub(
         self,
-        volumes: List[Volume],
+        volumes: List["Volume"],
         output: Path,
         title: str,
         author: str,
@@ -34,6 +292,8 @@ class Writer:
         """
         生成 EPUB 文件
 
+        章节逐个渲染并直接写入 ZIP，不在内存中保留整本书
+
         Args:
             volumes: 卷列表
             output: 输出文件路径
@@ -42,213 +302,150 @@ class Writer:
             language: 语言代码
             cover: 封面图片路径
         """
-        # 创建 EPUB 书籍对象
-        book = epub.EpubBook()
-
-        # 设置基本信息
-        book.set_identifier(f"epuber-{title}-{author}")
-        book.set_title(title)
-        book.set_language(language)
-
-        # 添加作者信息
-        book.add_author(author)
-
-        # 创建章节
-        epub_chapters = []
-        toc_items = []
-
-        total_chapters = sum(len(volume.chapters) for volume in volumes)
-        chapter_pbar = tqdm(
-            total=total_chapters,
-            desc="写入章节",
-            unit="章",
-            disable=not show_progress,
-        )
-
-        for volume in volumes:
-            # 为每个卷创建标题页（可选）
-            if volume.title:
-                volume_chapter = epub.EpubHtml(
-                    title=volume.title, file_name=f"volume_{len(epub_chapters)}.xhtml", lang=language
-                )
-                volume_chapter.content = f"<h1>{volume.title}</h1>"
-                book.add_item(volume_chapter)
-                epub_chapters.append(volume_chapter)
-                toc_items.append(volume_chapter)
-
-            # 添加卷中的章节
-            for chapter in volume.chapters:
-                epub_chapter = epub.EpubHtml(
-                    title=chapter.title, file_name=f"chapter_{len(epub_chapters)}.xhtml", lang=language
-                )
-
-                title_html = f"<h1>{chapter.title}</h1>"
-                epub_chapter.content = title_html + "\n" + chapter.content
-
-                book.add_item(epub_chapter)
-                epub_chapters.append(epub_chapter)
-                toc_items.append(epub_chapter)
-                chapter_pbar.update(1)
-
-        chapter_pbar.close()
-
-        # 添加封面（返回封面页以便加入阅读顺序）
-        cover_page = None
-        if cover and cover.exists():
-            cover_page = self._add_cover(book, cover)
-        elif self.cover_gen:
-            # 自动生成封面
-            try:
-                cover_data = self.cover_gen.make(title, author, cover_style)
-                cover_page = self._add_generated_cover(book, cover_data)
-            except Exception as e:
-                print(f"警告: 无法生成自动封面: {e}")
-
-        # 添加默认样式
-        self._add_default_styles(book)
-
-        # 设置目录结构
-        book.toc = toc_items
-
-        # 添加导航文件
-        book.add_item(epub.EpubNcx())
-        nav_file = epub.EpubNav()
-        book.add_item(nav_file)
-
-        # 立即为导航文件添加CSS链接
-        if hasattr(nav_file, "add_link"):
-            nav_file.add_link(href="style/default.css", rel="stylesheet", type="text/css")
-
-        # 设置阅读顺序（优先展示封面 -> 目录 -> 正文）
-        spine_items = []
-        if cover_page:
-            spine_items.append(cover_page)
-        spine_items.append("nav")
-        spine_items.extend(epub_chapters)
-        book.spine = spine_items
-
-        # 生成 EPUB 文件
         try:
-            epub.write_epub(str(output), book, {})
+            # 文本内容使用最快的压缩级别，体积略大但压缩耗时大幅减少
+            with zipfile.ZipFile(output, "w", zipfile.ZIP_DEFLATED, compresslevel=_COMPRESS_LEVEL) as zf:
+                writer = _StreamingEpubWriter(zf, language)
+
+                # 添加默认样式（先写入，页面生成时即可带上样式链接）
+                self._add_default_styles(writer)
+
+                # 添加封面（返回封面页以便加入阅读顺序）
+                cover_page = None
+                if cover and cover.exists():
+                    cover_page = self._add_cover(writer, cover)
+                elif self.cover_gen:
+                    # 自动生成封面
+                    try:
+                        cover_data = self.cover_gen.make(title, author, cover_style)
+                        cover_page = self._add_generated_cover(writer, cover_data)
+                    except Exception as e:
+                        print(f"警告: 无法生成自动封面: {e}")
+
+                # 创建章节
+                page_count = 0
+                # 进度条按批更新，避免每章都刷新终端；不显示进度时不创建进度条，也不统计章节总数
+                chapter_pbar = None
+                batch = 1
+                pending = 0
+                if show_progress:
+                    from tqdm import tqdm
+
+                    total_chapters = sum(len(volume.chapters) for volume in volumes)
+                    chapter_pbar = tqdm(total=total_chapters, desc="写入章节", unit="章", mininterval=0.5)
+                    batch = max(1, total_chapters // 200)
+
+                for volume in volumes:
+                    # 为每个卷创建标题页（可选）
+                    if volume.title:
+                        writer.add_page(f"volume_{page_count}", f"volume_{page_count}.xhtml", volume.title)
+                        page_count += 1
+
+                    # 添加卷中的章节
+                    for chapter in volume.chapters:
+                        writer.add_page(
+                            f"chapter_{page_count}", f"chapter_{page_count}.xhtml", chapter.title, chapter.content
+                        )
+                        page_count += 1
+                        pending += 1
+                        if chapter_pbar is not None and pending >= batch:
+                            chapter_pbar.update(pending)
+                            pending = 0
+
+                if chapter_pbar is not None:
+                    chapter_pbar.update(pending)
+                    chapter_pbar.close()
+
+                # 生成导航文件和包文档，设置阅读顺序（优先展示封面 -> 目录 -> 正文）
+                writer.finish(
+                    identifier=_book_identifier(title, author),
+                    title=title,
+                    author=author,
+                    front=[cover_page] if cover_page else [],
+                )
         except PermissionError:
             raise IOError(f"权限不足，无法写入文件: {output}")
         except OSError as e:
-            if hasattr(e, "errno"):
-                if e.errno == 28:  # No space left on device
-                    raise IOError(f"磁盘空间不足，无法生成EPUB文件: {output}")
-                elif e.errno == 36:  # File name too long
-                    raise IOError(f"文件路径过长: {output}")
-                elif e.errno == 2:  # No such file or directory
-                    raise IOError(f"输出目录不存在: {output.parent}")
+            # OSError 总有 errno 属性（可能为 None），直接比较即可
+            if e.errno == 28:  # No space left on device
+                raise IOError(f"磁盘空间不足，无法生成EPUB文件: {output}")
+            elif e.errno == 36:  # File name too long
+                raise IOError(f"文件路径过长: {output}")
+            elif e.errno == 2:  # No such file or directory
+                raise IOError(f"输出目录不存在: {output.parent}")
             raise IOError(f"文件写入失败: {e}")
 
-    def _add_cover(self, book: epub.EpubBook, cover_path: Path):
+    def _add_cover(self, writer: _StreamingEpubWriter, cover_path: Path) -> Optional[str]:
         """
         添加封面图片
 
         Args:
-            book: EPUB 书籍对象
+            writer: EPUB 写入器
             cover_path: 封面图片路径
+
+        Returns:
+            封面页标识，失败时返回 None
         """
         try:
-            # 读取图片文件
-            image_content = cover_path.read_bytes()
-
-            # 创建封面图片项
-            image_name = f"cover{cover_path.suffix}"
-            cover_image = epub.EpubImage()
-            cover_image.file_name = image_name
-            cover_image.media_type = self._get_image_mime_type(cover_path.suffix)
-            cover_image.content = image_content
-
-            # 创建封面图片项
-            cover_image = epub.EpubImage()
-            cover_image.file_name = image_name
-            cover_image.id = "cover-image"
-            cover_image.media_type = self._get_image_mime_type(cover_path.suffix)
-            cover_image.content = image_content
-            book.add_item(cover_image)
-
-            # 创建封面页面
-            cover_page = epub.EpubHtml(title="封面", file_name="cover.xhtml")
-            cover_page.id = "cover-page"
-            cover_page.content = f'<img src="{image_name}" alt="封面" style="max-width: 100%; height: auto;" />'
-            book.add_item(cover_page)
-
-            # 设置封面元数据（不自动生成封面页，避免重复）
-            book.add_metadata("http://www.idpf.org/2007/opf", "meta", "", {"name": "cover", "content": cover_image.id})
-
-            return cover_page
+            # 扩展名只转换一次小写，同时用于文件名和 MIME 类型
+            suffix = cover_path.suffix.lower()
+            # 内存映射图片文件，直接写入 ZIP，不额外复制一份图片数据
+            with cover_path.open("rb") as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+                return self._write_cover(writer, memoryview(mm), _IMAGE_MIME_TYPES.get(suffix, "image/jpeg"), suffix)
 
         except Exception as e:
             print(f"警告: 无法添加封面图片: {e}")
             return None
 
-    def _add_generated_cover(self, book: epub.EpubBook, cover_data: bytes):
+    def _add_generated_cover(self, writer: _StreamingEpubWriter, cover_data: bytes) -> str:
         """
         添加自动生成的封面
 
         Args:
-            book: EPUB书籍对象
+            writer: EPUB 写入器
             cover_data: PNG格式的封面数据
+
+        Returns:
+            封面页标识
         """
-        # 创建封面图片项
-        cover_image = epub.EpubImage()
-        cover_image.file_name = "cover.png"
-        cover_image.id = "cover-image"
-        cover_image.media_type = "image/png"
-        cover_image.content = cover_data
-        book.add_item(cover_image)
-
-        # 创建封面页面
-        cover_page = epub.EpubHtml(title="封面", file_name="cover.xhtml")
-        cover_page.id = "cover-page"
-        cover_page.content = '<img src="cover.png" alt="封面" style="max-width: 100%; height: auto;" />'
-        book.add_item(cover_page)
-
-        # 设置封面元数据
-        book.add_metadata("http://www.idpf.org/2007/opf", "meta", "", {"name": "cover", "content": cover_image.id})
-
-        return cover_page
-
-    def _get_image_mime_type(self, suffix: str) -> str:
+        return self._write_cover(writer, cover_data, "image/png", ".png")
+
+    def _write_cover(
+        self, writer: _StreamingEpubWriter, content: Union[bytes, memoryview], media_type: str, suffix: str
+    ) -> str:
         """
-        根据文件扩展名获取 MIME 类型
+        写入封面图片和封面页面，并设置封面元数据
 
         Args:
-            suffix: 文件扩展名
+            writer: EPUB 写入器
+            content: 图片数据
+            media_type: 图片 MIME 类型
+            suffix: 小写的图片扩展名
 
         Returns:
-            MIME 类型
+            封面页标识
         """
-        mime_types = {
-            ".jpg": "image/jpeg",
-            ".jpeg": "image/jpeg",
-            ".png": "image/png",
-            ".gif": "image/gif",
-            ".webp": "image/webp",
-        }
-        return mime_types.get(suffix.lower(), "image/jpeg")
-
-    def _add_default_styles(self, book: epub.EpubBook) -> None:
+        image_name = f"cover{suffix}"
+        writer.add_item("cover-image", image_name, media_type, content, properties="cover-image")
+        writer.add_page(
+            "cover-page",
+            "cover.xhtml",
+            "封面",
+            f'<img src="{image_name}" alt="封面" style="max-width: 100%; height: auto;" />',
+            heading=False,
+            in_toc=False,
+        )
+        writer.cover_image_id = "cover-image"
+        return "cover-page"
+
+    def _add_default_styles(self, writer: _StreamingEpubWriter) -> None:
         """
-        添加默认样式
+        添加默认样式，之后写入的页面都会链接该样式
 
         Args:
-            book: EPUB 书籍对象
+            writer: EPUB 写入器
         """
-        css_path = self.template_dir / "default.css"
-        if css_path.exists():
-            css_content = css_path.read_text(encoding="utf-8")
-            style = epub.EpubItem(
-                uid="style_default", file_name="style/default.css", media_type="text/css", content=css_content
-            )
-            book.add_item(style)
-
-            # 为所有HTML项目添加样式链接（包括导航文件）
-            for item in book.get_items():
-                if isinstance(item, epub.EpubHtml):
-                    item.add_link(href="style/default.css", rel="stylesheet", type="text/css")
-                # 单独处理导航文件
-                elif hasattr(item, "add_link") and item.file_name and item.file_name.endswith("nav.xhtml"):
-                    item.add_link(href="style/default.css", rel="stylesheet", type="text/css")
+        css = _load_template(self.template_dir / "default.css")
+        if css is not None:
+            writer.add_item("style_default", _STYLESHEET_HREF, "text/css", css)
+            writer.stylesheet = True
@@ -3,13 +3,13 @@ Epuber - EPUB 生成器主入口
 """
 
 import multiprocessing
+import os
 import re
 import traceback
 from pathlib import Path
 
 import typer
 
-from epuber.generator import EpubGenerator
 from epuber.logging import setup_logger
 
 app = typer.Typer(help="EPUB 生成器 - 将小说文本转换为 EPUB 格式")
@@ -31,6 +31,9 @@ def generate(
     """
     生成 EPUB 文件
     """
+    # 生成器依赖较多，只在执行命令时导入，保证 --help 等操作快速响应
+    from epuber.generator import EpubGenerator
+
     # 设置日志
     logger = setup_logger(verbose)
 
@@ -40,35 +43,21 @@ def generate(
         # 构建解析器配置
         parser_config = {}
 
-        # 验证并设置卷标题正则表达式
-        if volume_regex:
-            try:
-                re.compile(volume_regex)
-                parser_config["volume_patterns"] = [volume_regex]
-                logger.debug(f"使用自定义卷标题正则表达式: {volume_regex}")
-            except re.error as e:
-                logger.failure(f"卷标题正则表达式语法错误: {e}")
-                raise typer.Exit(1)
-
-        # 验证并设置章节标题正则表达式
-        if chapter_regex:
+        # 验证并设置自定义正则表达式
+        for key, label, raw in (
+            ("volume_patterns", "卷标题", volume_regex),
+            ("chapter_patterns", "章节标题", chapter_regex),
+            ("exclude_patterns", "排除模式", exclude_regex),
+        ):
+            if not raw:
+                continue
             try:
-                re.compile(chapter_regex)
-                parser_config["chapter_patterns"] = [chapter_regex]
-                logger.debug(f"使用自定义章节标题正则表达式: {chapter_regex}")
+                # 编译结果直接交给解析器复用
+                parser_config[key] = [re.compile(raw)]
             except re.error as e:
-                logger.failure(f"章节标题正则表达式语法错误: {e}")
-                raise typer.Exit(1)
-
-        # 验证并设置排除模式正则表达式
-        if exclude_regex:
-            try:
-                re.compile(exclude_regex)
-                parser_config["exclude_patterns"] = [exclude_regex]
-                logger.debug(f"使用自定义排除模式正则表达式: {exclude_regex}")
-            except re.error as e:
-                logger.failure(f"排除模式正则表达式语法错误: {e}")
+                logger.failure(f"{label}正则表达式语法错误: {e}")
                 raise typer.Exit(1)
+            logger.debug(f"使用自定义{label}正则表达式: {raw}")
 
         generator = EpubGenerator()
 
@@ -83,14 +72,16 @@ def generate(
             logger.failure(f"无法创建输出目录 '{output}': {e}")
             raise typer.Exit(1)
 
-        # 检查输出目录是否可写
-        try:
-            test_file = output / ".epuber_write_test"
-            test_file.write_text("test")
-            test_file.unlink()
-        except (OSError, PermissionError) as e:
-            logger.failure(f"输出目录 '{output}' 不可写: {e}")
-            raise typer.Exit(1)
+        # 检查输出目录是否可写：os.access 通过时不再写入测试文件，
+        # 不通过时（部分文件系统上 os.access 结果不可靠）再实际创建测试文件确认
+        if not os.access(output, os.W_OK):
+            try:
+                test_file = output / ".epuber_write_test"
+                os.close(os.open(test_file, os.O_CREAT | os.O_WRONLY, 0o600))
+                test_file.unlink()
+            except OSError as e:
+                logger.failure(f"输出目录 '{output}' 不可写: {e}")
+                raise typer.Exit(1)
 
         # 生成输出文件路径
         output_filename = input.stem + ".epub"
@@ -134,6 +125,8 @@ def validate(
     """
     验证 EPUB 文件格式
     """
+    from epuber.generator import EpubGenerator
+
     # 设置日志
     logger = setup_logger(verbose)
     try:
@@ -0,0 +1,20 @@
+"""
+测试共享夹具
+"""
+
+import pytest
+from typer.testing import CliRunner
+
+
+@pytest.fixture(scope="session")
+def runner():
+    """整个测试会话共用的 CLI 运行器"""
+    return CliRunner()
+
+
+@pytest.fixture(scope="session")
+def app():
+    """CLI 应用；首次使用时才导入 main，只收集测试时不加载 CLI 依赖"""
+    from main import app
+
+    return app
@@ -2,8 +2,7 @@
 测试解析器模块
 """
 
-import os
-import tempfile
+import re
 from pathlib import Path
 
 import pytest
@@ -13,6 +12,25 @@ from epuber.parser import Parser
 from epuber.schemas import Chapter, Volume
 
 
+@pytest.fixture(scope="session")
+def write_corpus(tmp_path_factory):
+    """写入测试语料并返回路径
+
+    整个测试会话共用一个临时目录，同名语料只写入一次
+    """
+    corpus_dir = tmp_path_factory.mktemp("parser_corpora")
+    written = {}
+
+    def write(name: str, data: bytes) -> Path:
+        if name not in written:
+            path = corpus_dir / name
+            path.write_bytes(data)
+            written[name] = path
+        return written[name]
+
+    return write
+
+
 class TestParser:
     """测试 Parser 类"""
 
@@ -20,10 +38,6 @@ class TestParser:
         """测试前准备"""
         self.parser = Parser()
 
-    def teardown_method(self):
-        """测试后清理"""
-        pass
-
     def test_init_default_config(self):
         """测试默认配置初始化"""
         parser = Parser()
@@ -45,7 +59,64 @@ class TestParser:
         assert parser.config["chapter_patterns"] == [r"^CH\d+"]
         assert parser.config["content_keywords"]["extra"] == ["EXTRA"]
 
-    def test_parse_with_volumes(self):
+    def test_init_compiled_patterns(self):
+        """测试使用已编译的正则表达式初始化"""
+        chapter_re = re.compile(r"^chapter\d+", re.IGNORECASE)
+        parser = Parser({"volume_patterns": [re.compile(r"^VOL\d+"), r"^BOOK\d+"], "chapter_patterns": [chapter_re]})
+
+        # 单个已编译表达式直接复用
+        assert parser._chapter_patterns == (chapter_re,)
+        assert parser._chapter_patterns[0] is chapter_re
+        assert parser._classify_line("VOL1") == "vol"
+        assert parser._classify_line("BOOK2") == "vol"
+        # 编译标志在合并后的表达式中保留
+        assert parser._line_re.match("CHAPTER1").lastgroup == "chap"
+
+    def test_init_inline_global_flags(self):
+        """测试以全局内联标志开头的自定义正则表达式"""
+        parser = Parser({"chapter_patterns": [r"(?i)^chapter \d+", r"^Part \d+"]})
+
+        assert parser._classify_line("CHAPTER 1") == "chap"
+        assert parser._classify_line("Part 2") == "chap"
+        # 全局标志改写为局部标志后只作用于原表达式
+        assert parser._classify_line("PART 3") is None
+        assert parser._line_re.match("Chapter 3").lastgroup == "chap"
+
+    def test_init_duplicate_group_names(self):
+        """测试多个表达式使用相同的分组名"""
+        parser = Parser({"chapter_patterns": [r"^CH(?P<num>\d+)", r"^Chapter(?P<num>\d+)"]})
+
+        assert len(parser._chapter_patterns) == 2
+        assert parser._classify_line("CH1") == "chap"
+        assert parser._classify_line("Chapter2") == "chap"
+
+    def test_classify_line_with_backreference(self, write_corpus):
+        """测试含反向引用的自定义表达式：不融合，逐类匹配"""
+        parser = Parser({"chapter_patterns": [r"^(=+)[^=]+\1$"]})
+
+        assert parser._line_re is None
+        assert parser._classify_line("== 开始 ==") == "chap"
+        assert parser._classify_line("== 开始 =") is None
+
+        temp_file = write_corpus("backreference.txt", "== 开始 ==\n内容一\n=== 继续 ===\n内容二\n".encode())
+        volumes = parser.parse(temp_file)
+        assert [chapter.title for chapter in volumes[0].chapters] == ["== 开始 ==", "=== 继续 ==="]
+
+    def test_classify_line_group_name_collision(self):
+        """测试自定义表达式的分组名与类别名相同"""
+        parser = Parser({"volume_patterns": [r"^卷(?P<vol>\d+)"], "chapter_patterns": [r"^章(?P<chap>\d+)"]})
+
+        assert parser._classify_line("卷1") == "vol"
+        assert parser._classify_line("章2") == "chap"
+        assert parser._classify_line("版权声明") == "excl"
+        assert parser._classify_line("正文") is None
+
+    def test_init_invalid_pattern(self):
+        """测试语法错误的正则表达式在初始化时报错"""
+        with pytest.raises(re.error):
+            Parser({"chapter_patterns": [r"^第(\d+章"]})
+
+    def test_parse_with_volumes(self, write_corpus):
         """测试有卷标题的解析"""
         content = """第一卷 相遇
 
@@ -68,38 +139,32 @@ class TestParser:
 感谢读者...
 """
 
-        with tempfile.NamedTemporaryFile(mode="w", suffix=".txt", encoding="utf-8", delete=False) as f:
-            f.write(content)
-            temp_file = f.name
-
-        try:
-            volumes = self.parser.parse(Path(temp_file))
+        temp_file = write_corpus("parse_with_volumes.txt", content.encode("utf-8"))
 
-            # 应该有3个卷：第一卷（包含卷标题+2章）、番外、后记
-            assert len(volumes) == 3
+        volumes = self.parser.parse(temp_file)
 
-            # 检查第一卷
-            vol1 = volumes[0]
-            assert vol1.title == "第一卷 相遇"
-            assert len(vol1.chapters) == 3
-            assert vol1.chapters[0].title == "第一卷 相遇"
-            assert vol1.chapters[1].title == "第1章 初遇"
-            assert vol1.chapters[2].title == "第2章 发展"
+        # 应该有3个卷：第一卷（包含卷标题+2章）、番外、后记
+        assert len(volumes) == 3
 
-            # 检查番外
-            extra_vol = next(v for v in volumes if "番外" in v.title)
-            assert len(extra_vol.chapters) == 1
-            assert extra_vol.chapters[0].content_type == "extra"
+        # 检查第一卷
+        vol1 = volumes[0]
+        assert vol1.title == "第一卷 相遇"
+        assert len(vol1.chapters) == 3
+        assert vol1.chapters[0].title == "第一卷 相遇"
+        assert vol1.chapters[1].title == "第1章 初遇"
+        assert vol1.chapters[2].title == "第2章 发展"
 
-            # 检查后记
-            postscript_vol = next(v for v in volumes if "后记" in v.title)
-            assert len(postscript_vol.chapters) == 1
-            assert postscript_vol.chapters[0].content_type == "postscript"
+        # 检查番外
+        extra_vol = next(v for v in volumes if "番外" in v.title)
+        assert len(extra_vol.chapters) == 1
+        assert extra_vol.chapters[0].content_type == "extra"
 
-        finally:
-            os.unlink(temp_file)
+        # 检查后记
+        postscript_vol = next(v for v in volumes if "后记" in v.title)
+        assert len(postscript_vol.chapters) == 1
+        assert postscript_vol.chapters[0].content_type == "postscript"
 
-    def test_parse_without_volumes(self):
+    def test_parse_without_volumes(self, write_corpus):
         """测试无卷标题的解析（扁平结构）"""
         content = """第1章 开始
 
@@ -118,34 +183,28 @@ class TestParser:
 感谢读者支持...
 """
 
-        with tempfile.NamedTemporaryFile(mode="w", suffix=".txt", encoding="utf-8", delete=False) as f:
-            f.write(content)
-            temp_file = f.name
-
-        try:
-            volumes = self.parser.parse(Path(temp_file))
+        temp_file = write_corpus("parse_without_volumes.txt", content.encode("utf-8"))
 
-            # 应该有1个卷，包含所有章节作为第一层级
-            assert len(volumes) == 1
-            assert volumes[0].title is None
+        volumes = self.parser.parse(temp_file)
 
-            # 卷中有4个章节
-            assert len(volumes[0].chapters) == 4
+        # 应该有1个卷，包含所有章节作为第一层级
+        assert len(volumes) == 1
+        assert volumes[0].title is None
 
-            chapter_titles = [c.title for c in volumes[0].chapters]
-            assert "第1章 开始" in chapter_titles
-            assert "第2章 发展" in chapter_titles
-            assert "番外：额外" in chapter_titles
-            assert "后记" in chapter_titles
+        # 卷中有4个章节
+        assert len(volumes[0].chapters) == 4
 
-            # 检查内容类型
-            postscript_chapter = next(c for c in volumes[0].chapters if "后记" in c.title)
-            assert postscript_chapter.content_type == "postscript"
+        chapter_titles = [c.title for c in volumes[0].chapters]
+        assert "第1章 开始" in chapter_titles
+        assert "第2章 发展" in chapter_titles
+        assert "番外：额外" in chapter_titles
+        assert "后记" in chapter_titles
 
-        finally:
-            os.unlink(temp_file)
+        # 检查内容类型
+        postscript_chapter = next(c for c in volumes[0].chapters if "后记" in c.title)
+        assert postscript_chapter.content_type == "postscript"
 
-    def test_parse_custom_config(self):
+    def test_parse_custom_config(self, write_corpus):
         """测试自定义配置解析"""
         custom_config = {
             "volume_patterns": [r"^VOL\d+"],
@@ -171,27 +230,21 @@ ENDING
 The end...
 """
 
-        with tempfile.NamedTemporaryFile(mode="w", suffix=".txt", encoding="utf-8", delete=False) as f:
-            f.write(content)
-            temp_file = f.name
-
-        try:
-            volumes = parser.parse(Path(temp_file))
+        temp_file = write_corpus("parse_custom_config.txt", content.encode("utf-8"))
 
-            # 应该有3个卷：VOL1（包含VOL1+CH1）、EXTRA、ENDING
-            assert len(volumes) == 3
+        volumes = parser.parse(temp_file)
 
-            vol1 = next(v for v in volumes if "VOL1" in v.title)
-            assert len(vol1.chapters) == 2  # VOL1 + CH1
-            assert vol1.chapters[0].title == "VOL1 Start"
-            assert vol1.chapters[1].title == "CH1 Meet"
+        # 应该有3个卷：VOL1（包含VOL1+CH1）、EXTRA、ENDING
+        assert len(volumes) == 3
 
-            extra_vol = next(v for v in volumes if "EXTRA" in v.title)
-            assert len(extra_vol.chapters) == 1
-            assert extra_vol.chapters[0].content_type == "extra"
+        vol1 = next(v for v in volumes if "VOL1" in v.title)
+        assert len(vol1.chapters) == 2  # VOL1 + CH1
+        assert vol1.chapters[0].title == "VOL1 Start"
+        assert vol1.chapters[1].title == "CH1 Meet"
 
-        finally:
-            os.unlink(temp_file)
+        extra_vol = next(v for v in volumes if "EXTRA" in v.title)
+        assert len(extra_vol.chapters) == 1
+        assert extra_vol.chapters[0].content_type == "extra"
 
     def test_split_chapters(self):
         """测试章节分割功能"""
@@ -216,8 +269,9 @@ The end...
 感谢读者支持。
 """
 
-        chapters = self.parser._split_chapters(content)
+        chapters, has_volumes = self.parser._split_chapters(content)
 
+        assert has_volumes
         assert len(chapters) == 5
         assert chapters[0]["title"] == "第一卷 相遇"
         assert chapters[0]["is_volume"]
@@ -227,38 +281,55 @@ The end...
         assert chapters[3]["title"] == "番外：回忆"
         assert chapters[4]["title"] == "后记"
 
-    def test_is_volume_title(self):
-        """测试卷标题识别"""
-        assert self.parser._is_volume_title("第一卷 相遇")
-        assert self.parser._is_volume_title("第2部 发展")
-        assert self.parser._is_volume_title("上卷")
-        assert not self.parser._is_volume_title("第1章 初遇")
-        assert not self.parser._is_volume_title("普通内容")
-
-    def test_is_chapter_title(self):
-        """测试章节标题识别"""
-        assert self.parser._is_chapter_title("第1章 初遇")
-        assert self.parser._is_chapter_title("番外：回忆")
-        assert self.parser._is_chapter_title("后记")
-        assert not self.parser._is_chapter_title("第一卷 相遇")  # 卷标题不应该是章节标题
-        assert not self.parser._is_chapter_title("普通内容行")
-
-    def test_is_exclude_line(self):
-        """测试排除行识别"""
+    def test_split_chapters_candidate_lines(self):
+        """测试缩进或过长的标题行作为正文处理"""
+        content = "第1章 开始\n内容\n  第2章 缩进\n第3章 " + "长" * 40 + "\n更多内容\n"
+
+        chapters, has_volumes = self.parser._split_chapters(content)
+
+        assert not has_volumes
+        assert len(chapters) == 1
+        assert chapters[0]["title"] == "第1章 开始"
+        assert "第2章 缩进" in chapters[0]["content"]
+        assert "更多内容" in chapters[0]["content"]
+
+    def test_clean_title(self):
+        """测试标题清洗"""
+        assert self.parser._clean_title(" 第1章 初遇 ") == "第1章 初遇"
+        assert self.parser._clean_title("第1章 初遇【求月票求推荐】") == "第1章 初遇"
+        assert self.parser._clean_title("第2章 发展 (本章完结)") == "第2章 发展"
+
+        # 自定义清洗规则不受默认括号判断影响
+        parser = Parser({"title_clean_patterns": [r"-\s*求收藏$"]})
+        assert parser._clean_title("第1章 初遇 - 求收藏") == "第1章 初遇"
+
+        # 清洗规则依次执行，后面的规则作用于前面规则的结果
+        parser = Parser({"title_clean_patterns": [r"^【.*?】", r"^\s*-\s*"]})
+        assert parser._clean_title("【VIP】 - 第1章 初遇") == "第1章 初遇"
+
+    def test_classify_line(self):
+        """测试候选标题行分类：排除 -> 卷 -> 章"""
+        # 卷标题
+        assert self.parser._classify_line("第一卷 相遇") == "vol"
+        assert self.parser._classify_line("第2部 发展") == "vol"
+        assert self.parser._classify_line("上卷") == "vol"
+
+        # 章节标题
+        assert self.parser._classify_line("第1章 初遇") == "chap"
+        assert self.parser._classify_line("番外：回忆") == "chap"
+        assert self.parser._classify_line("后记") == "chap"
+
         # 应该被排除的行
-        assert self.parser._is_exclude_line("版权声明：本书版权归作者所有")
-        assert self.parser._is_exclude_line("免责声明：本书内容纯属虚构")
-        assert self.parser._is_exclude_line("最后更新时间：2024-01-01")
-        assert self.parser._is_exclude_line("本书由某某平台提供")
-        assert self.parser._is_exclude_line("著作权声明")
-        assert self.parser._is_exclude_line("第 5 页")
-        assert self.parser._is_exclude_line("10/100")
-
-        # 不应该被排除的行（正常章节标题）
-        assert not self.parser._is_exclude_line("第一章 开始冒险")
-        assert not self.parser._is_exclude_line("第二章 遇到困难")
-        assert not self.parser._is_exclude_line("番外：回忆")
-        assert not self.parser._is_exclude_line("普通内容行")
+        assert self.parser._classify_line("版权声明：本书版权归作者所有") == "excl"
+        assert self.parser._classify_line("免责声明：本书内容纯属虚构") == "excl"
+        assert self.parser._classify_line("最后更新时间：2024-01-01") == "excl"
+        assert self.parser._classify_line("本书由某某平台提供") == "excl"
+        assert self.parser._classify_line("著作权声明") == "excl"
+        assert self.parser._classify_line("第 5 页") == "excl"
+        assert self.parser._classify_line("10/100") == "excl"
+
+        # 普通内容
+        assert self.parser._classify_line("普通内容行") is None
 
     def test_detect_content_type(self):
         """测试内容类型检测"""
@@ -267,20 +338,6 @@ The end...
         assert self.parser._detect_content_type("后记") == "postscript"
         assert self.parser._detect_content_type("公告：更新") == "notice"
 
-    def test_has_volumes(self):
-        """测试卷检测"""
-        chapters_with_volumes = [
-            {"title": "第一卷 相遇", "is_volume": True},
-            {"title": "第1章 初遇", "is_volume": False},
-        ]
-        chapters_without_volumes = [
-            {"title": "第1章 初遇", "is_volume": False},
-            {"title": "第2章 发展", "is_volume": False},
-        ]
-
-        assert self.parser._has_volumes(chapters_with_volumes)
-        assert not self.parser._has_volumes(chapters_without_volumes)
-
     def test_create_flat_structure(self):
         """测试扁平结构创建"""
         chapters = [
@@ -335,20 +392,15 @@ The end...
         with pytest.raises(FileParseError):
             self.parser.parse(Path("nonexistent_file.txt"))
 
-    def test_parse_empty_file(self):
+    def test_parse_empty_file(self, write_corpus):
         """测试空文件"""
-        with tempfile.NamedTemporaryFile(mode="w", suffix=".txt", encoding="utf-8", delete=False) as f:
-            f.write("")  # 空文件
-            temp_file = f.name
-
-        try:
-            # 空文件应该抛出异常（设计文档要求）
-            with pytest.raises(FileParseError, match="未能在文件中找到任何章节"):
-                self.parser.parse(Path(temp_file))
-        finally:
-            os.unlink(temp_file)
-
-    def test_parse_with_exclude_lines(self):
+        temp_file = write_corpus("parse_empty_file.txt", b"")  # 空文件
+
+        # 空文件应该抛出异常（设计文档要求）
+        with pytest.raises(FileParseError, match="未能在文件中找到任何章节"):
+            self.parser.parse(temp_file)
+
+    def test_parse_with_exclude_lines(self, write_corpus):
         """测试解析包含排除行的文件"""
         content = """版权声明：本书版权归作者所有，未经许可不得转载。
 
@@ -374,103 +426,125 @@ The end...
 故事圆满结束。
 """
 
-        with tempfile.NamedTemporaryFile(mode="w", suffix=".txt", encoding="utf-8", delete=False) as f:
-            f.write(content)
-            temp_path = f.name
+        temp_path = write_corpus("parse_with_exclude_lines.txt", content.encode("utf-8"))
 
-        try:
-            volumes = self.parser.parse(Path(temp_path))
+        volumes = self.parser.parse(temp_path)
 
-            # 应该有1个卷，包含所有有效章节
-            assert len(volumes) == 1
-            assert volumes[0].title is None
-            assert len(volumes[0].chapters) == 3
+        # 应该有1个卷，包含所有有效章节
+        assert len(volumes) == 1
+        assert volumes[0].title is None
+        assert len(volumes[0].chapters) == 3
+
+        # 验证章节标题
+        chapter_titles = [chapter.title for chapter in volumes[0].chapters]
+        assert "第一章 开始冒险" in chapter_titles
+        assert "第二章 遇到困难" in chapter_titles
+        assert "第三章 解决难题" in chapter_titles
+
+        # 验证没有版权声明等被当作章节标题
+        for title in chapter_titles:
+            assert not title.startswith("版权声明")
+            assert not title.startswith("免责声明")
+            assert not title.startswith("最后更新时间")
+            assert not title.startswith("本书由")
+
+    def test_parse_many(self, monkeypatch, write_corpus):
+        """测试批量解析多个文件，结果与逐个解析一致且保持输入顺序"""
+        # 模拟多核环境，确保走进程池路径
+        monkeypatch.setattr("epuber.parser.os.cpu_count", lambda: 2)
+        file_paths = [
+            write_corpus(f"parse_many_{i}.txt", f"第一章 开始\n第{i}本书的内容\n".encode()) for i in range(3)
+        ]
 
-            # 验证章节标题
-            chapter_titles = [chapter.title for chapter in volumes[0].chapters]
-            assert "第一章 开始冒险" in chapter_titles
-            assert "第二章 遇到困难" in chapter_titles
-            assert "第三章 解决难题" in chapter_titles
+        results = self.parser.parse_many(file_paths)
 
-            # 验证没有版权声明等被当作章节标题
-            for title in chapter_titles:
-                assert not title.startswith("版权声明")
-                assert not title.startswith("免责声明")
-                assert not title.startswith("最后更新时间")
-                assert not title.startswith("本书由")
+        assert len(results) == 3
+        for file_path, volumes in zip(file_paths, results):
+            assert volumes == self.parser.parse(file_path)
+        assert results[2][0].chapters[0].content == "第2本书的内容"
 
-        finally:
-            os.unlink(temp_path)
+    def test_parse_many_propagates_errors(self, write_corpus):
+        """测试批量解析时单个文件失败会抛出异常"""
+        file_paths = [
+            write_corpus("parse_many_ok.txt", "第一章 开始\n内容\n".encode()),
+            Path("nonexistent.txt"),
+        ]
 
-    def test_read_file_content_utf8(self):
+        with pytest.raises(FileParseError):
+            self.parser.parse_many(file_paths)
+
+    def test_read_file_content_utf8(self, write_corpus):
         """测试UTF-8文件读取"""
         content = "第1章 测试\n这是UTF-8内容"
-        with tempfile.NamedTemporaryFile(mode="w", suffix=".txt", encoding="utf-8", delete=False) as f:
-            f.write(content)
-            temp_file = f.name
+        temp_file = write_corpus("read_file_content_utf8.txt", content.encode("utf-8"))
 
-        try:
-            result = self.parser._read_file_content(Path(temp_file))
-            assert result == content
-        finally:
-            os.unlink(temp_file)
+        result = self.parser._read_file_content(temp_file)
+        assert result == content
 
-    def test_read_file_content_utf8_with_bom(self):
+    def test_read_file_content_utf8_with_bom(self, write_corpus):
         """测试带BOM的UTF-8文件读取"""
         content = "第1章 测试\n这是带BOM的UTF-8内容"
-        with tempfile.NamedTemporaryFile(mode="w", suffix=".txt", encoding="utf-8-sig", delete=False) as f:
-            f.write(content)
-            temp_file = f.name
+        temp_file = write_corpus("read_file_content_utf8_with_bom.txt", content.encode("utf-8-sig"))
+
+        result = self.parser._read_file_content(temp_file)
+        assert result == content
 
-        try:
-            result = self.parser._read_file_content(Path(temp_file))
+    def test_read_file_content_utf16_with_bom(self, write_corpus):
+        """测试带BOM的UTF-16文件读取"""
+        content = "第1章 测试\n这是带BOM的UTF-16内容"
+        for encoding in ("utf-16-le", "utf-16-be"):
+            temp_file = write_corpus(f"read_file_content_{encoding}.txt", f"\ufeff{content}".encode(encoding))
+
+            result = self.parser._read_file_content(temp_file)
             assert result == content
-        finally:
-            os.unlink(temp_file)
 
-    def test_read_file_content_gbk(self):
+    def test_read_file_content_gbk(self, write_corpus):
         """测试GBK编码文件读取"""
         content = "第1章 测试\n这是GBK编码内容"
         # 创建GBK编码的文件
-        with tempfile.NamedTemporaryFile(mode="wb", suffix=".txt", delete=False) as f:
-            f.write(content.encode("gbk"))
-            temp_file = f.name
+        temp_file = write_corpus("read_file_content_gbk.txt", content.encode("gbk"))
 
-        try:
-            result = self.parser._read_file_content(Path(temp_file))
-            assert result == content
-        finally:
-            os.unlink(temp_file)
+        result = self.parser._read_file_content(temp_file)
+        assert result == content
 
-    def test_read_file_content_big5(self):
+    def test_read_file_content_without_charset_normalizer(self, monkeypatch, write_corpus):
+        """测试未安装charset-normalizer时回退到chardet"""
+        monkeypatch.setattr("epuber.parser.from_bytes", None)
+        content = "第1章 测试\n这是GBK编码内容"
+        temp_file = write_corpus("read_file_content_gbk.txt", content.encode("gbk"))
+
+        result = self.parser._read_file_content(temp_file)
+        assert result == content
+
+    def test_read_file_content_sample_boundary(self, write_corpus):
+        """测试超过采样大小、且在64KiB处切断多字节字符的文件仍能正确识别编码"""
+        line = "これは日本語のテストです。吾輩は猫である。名前はまだ無い。\n"
+        # 开头的单字节 ASCII 使 64KiB 边界落在双字节字符中间
+        content = "a" + line * (80000 // len(line.encode("shift_jis")))
+        temp_file = write_corpus("read_file_content_sample_boundary.txt", content.encode("shift_jis"))
+
+        result = self.parser._read_file_content(temp_file)
+        assert result == content
+
+    def test_read_file_content_big5(self, write_corpus):
         """测试Big5编码文件读取"""
         content = "第1章 測試\n這是Big5編碼內容"
         # 创建Big5编码的文件
-        with tempfile.NamedTemporaryFile(mode="wb", suffix=".txt", delete=False) as f:
-            f.write(content.encode("big5"))
-            temp_file = f.name
+        temp_file = write_corpus("read_file_content_big5.txt", content.encode("big5"))
 
-        try:
-            result = self.parser._read_file_content(Path(temp_file))
-            assert result == content
-        finally:
-            os.unlink(temp_file)
+        result = self.parser._read_file_content(temp_file)
+        assert result == content
 
-    def test_read_file_content_corrupted(self):
+    def test_read_file_content_corrupted(self, write_corpus):
         """测试损坏文件的情况"""
         # 创建包含无效UTF-8序列的文件
-        with tempfile.NamedTemporaryFile(mode="wb", suffix=".txt", delete=False) as f:
-            # 写入一些无效的字节序列
-            f.write(b"\xff\xfe\x00\x00\x01\x00\x00\x00")
-            temp_file = f.name
-
-        try:
-            # 应该能够用错误替换的方式读取
-            result = self.parser._read_file_content(Path(temp_file))
-            assert isinstance(result, str)
-            assert len(result) > 0
-        finally:
-            os.unlink(temp_file)
+        # 写入一些无效的字节序列
+        temp_file = write_corpus("read_file_content_corrupted.txt", b"\xff\xfe\x00\x00\x01\x00\x00\x00")
+
+        # 应该能够用错误替换的方式读取
+        result = self.parser._read_file_content(temp_file)
+        assert isinstance(result, str)
+        assert len(result) > 0
 
 
 class TestSchemas:
@@ -2,7 +2,7 @@
 测试文本处理器模块
 """
 
-from epuber.processor import TextProcessor
+from epuber.processor import TextProcessor, escape_html
 
 
 class TestTextProcessor:
@@ -12,10 +12,6 @@ class TestTextProcessor:
         """测试前准备"""
         self.processor = TextProcessor()
 
-    def teardown_method(self):
-        """测试后清理"""
-        pass
-
     def test_init(self):
         """测试初始化"""
         processor = TextProcessor()
@@ -83,6 +79,16 @@ class TestTextProcessor:
         # 测试组合转义
         assert self.processor._escape_html("<>&") == "&lt;&gt;&amp;"
 
+    def test_escape_html_quotes(self):
+        """测试引号转义，且&最先替换，不会重复转义"""
+        assert escape_html("\"a\" 'b'") == "&quot;a&quot; &#39;b&#39;"
+        assert escape_html("&lt;") == "&amp;lt;"
+
+    def test_process_content_escapes_each_line(self):
+        """测试整段转义后逐行去空白，结果与逐行转义一致"""
+        content = "  a < b  \n\n\t'c' & d\t\n   "
+        assert self.processor.process_content(content) == "<p>a &lt; b</p>\n<p>&#39;c&#39; &amp; d</p>"
+
     def test_process_content_chinese_chars(self):
         """测试中文字符处理"""
         content = """中文内容
@@ -99,3 +105,9 @@ class TestTextProcessor:
         # 检查HTML结构
         assert "<p>" in result
         assert "</p>" in result
+
+    def test_process_many(self):
+        """测试批量处理保持输入顺序"""
+        contents = ["第一章内容", "", "第三章<内容>"]
+        results = list(self.processor.process_many(contents))
+        assert results == [self.processor.process_content(c) for c in contents]
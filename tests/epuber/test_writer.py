@@ -2,24 +2,24 @@
 测试写入器模块
 """
 
-import tempfile
+import io
+import zipfile
 from pathlib import Path
 
 import pytest
 
 from epuber.schemas import Chapter, Volume
 
-# 可选导入Writer和ebooklib
+# 可选导入Writer和lxml
 try:
-    from ebooklib import epub
+    from epuber.writer import Writer, _book_identifier, _StreamingEpubWriter
 
-    from epuber.writer import Writer
-
-    HAS_EBOOKLIB = True
+    HAS_LXML = True
 except ImportError:
     Writer = None
-    epub = None
-    HAS_EBOOKLIB = False
+    _book_identifier = None
+    _StreamingEpubWriter = None
+    HAS_LXML = False
 
 
 class TestWriter:
@@ -27,40 +27,31 @@ class TestWriter:
 
     def setup_method(self):
         """测试前准备"""
-        if not HAS_EBOOKLIB:
-            pytest.skip("ebooklib not available, skipping Writer tests")
+        if not HAS_LXML:
+            pytest.skip("lxml not available, skipping Writer tests")
         self.writer = Writer()
 
-    def teardown_method(self):
-        """测试后清理"""
-        pass
-
     def test_init(self):
         """测试初始化"""
         writer = Writer()
         assert writer.template_dir is not None
         assert writer.template_dir.name == "templates"
 
-    def test_write_epub_basic(self):
+    def test_write_epub_basic(self, tmp_path):
         """测试基本EPUB写入"""
         # 创建测试数据
         chapter = Chapter(title="测试章节", content="<p>测试内容</p>", content_type="chapter")
         volume = Volume(title="测试卷", chapters=[chapter])
 
-        output_file = Path(tempfile.mktemp(suffix=".epub"))
-
-        try:
-            self.writer.write_epub(volumes=[volume], output=output_file, title="测试小说", author="测试作者")
+        output_file = tmp_path / "output.epub"
 
-            # 检查输出文件
-            assert output_file.exists()
-            assert output_file.stat().st_size > 0
+        self.writer.write_epub(volumes=[volume], output=output_file, title="测试小说", author="测试作者")
 
-        finally:
-            if output_file.exists():
-                output_file.unlink()
+        # 检查输出文件
+        assert output_file.exists()
+        assert output_file.stat().st_size > 0
 
-    def test_write_epub_multiple_volumes(self):
+    def test_write_epub_multiple_volumes(self, tmp_path):
         """测试多卷EPUB写入"""
         volumes = []
 
@@ -70,66 +61,49 @@ class TestWriter:
             volume = Volume(title=f"第{i}卷", chapters=[chapter])
             volumes.append(volume)
 
-        output_file = Path(tempfile.mktemp(suffix=".epub"))
+        output_file = tmp_path / "output.epub"
 
-        try:
-            self.writer.write_epub(volumes=volumes, output=output_file, title="多卷测试小说", author="测试作者")
+        self.writer.write_epub(volumes=volumes, output=output_file, title="多卷测试小说", author="测试作者")
 
-            assert output_file.exists()
-            assert output_file.stat().st_size > 0
+        assert output_file.exists()
+        assert output_file.stat().st_size > 0
 
-        finally:
-            if output_file.exists():
-                output_file.unlink()
-
-    def test_write_epub_with_cover(self):
+    def test_write_epub_with_cover(self, tmp_path):
         """测试带封面的EPUB写入"""
         chapter = Chapter(title="测试章节", content="<p>测试内容</p>", content_type="chapter")
         volume = Volume(title="测试卷", chapters=[chapter])
 
         # 创建临时封面文件
-        cover_file = Path(tempfile.mktemp(suffix=".png"))
+        cover_file = tmp_path / "cover.png"
         cover_file.write_bytes(b"fake png data")
 
-        output_file = Path(tempfile.mktemp(suffix=".epub"))
-
-        try:
-            self.writer.write_epub(
-                volumes=[volume], output=output_file, title="测试小说", author="测试作者", cover=cover_file
-            )
+        output_file = tmp_path / "output.epub"
 
-            assert output_file.exists()
+        self.writer.write_epub(
+            volumes=[volume], output=output_file, title="测试小说", author="测试作者", cover=cover_file
+        )
 
-        finally:
-            if cover_file.exists():
-                cover_file.unlink()
-            if output_file.exists():
-                output_file.unlink()
+        assert output_file.exists()
 
-    def test_write_epub_different_languages(self):
+    def test_write_epub_different_languages(self, tmp_path):
         """测试不同语言的EPUB写入"""
         chapter = Chapter(title="Test Chapter", content="<p>Test content</p>", content_type="chapter")
         volume = Volume(title="Test Volume", chapters=[chapter])
 
-        output_file = Path(tempfile.mktemp(suffix=".epub"))
-
-        try:
-            self.writer.write_epub(
-                volumes=[volume], output=output_file, title="Test Novel", author="Test Author", language="en"
-            )
+        output_file = tmp_path / "output.epub"
 
-            assert output_file.exists()
+        self.writer.write_epub(
+            volumes=[volume], output=output_file, title="Test Novel", author="Test Author", language="en"
+        )
 
-        finally:
-            if output_file.exists():
-                output_file.unlink()
+        assert output_file.exists()
 
-    def test_get_image_mime_type(self):
-        """测试MIME类型获取"""
+    def test_cover_image_mime_type(self, tmp_path):
+        """测试封面图片按扩展名确定MIME类型"""
         # 测试各种扩展名
         test_cases = [
             (".jpg", "image/jpeg"),
-            (".jpeg", "image/jpeg"),
+            (".JPEG", "image/jpeg"),
             (".png", "image/png"),
             (".gif", "image/gif"),
             (".webp", "image/webp"),
@@ -137,72 +111,133 @@ class TestWriter:
         ]
 
         for ext, expected in test_cases:
-            result = self.writer._get_image_mime_type(ext)
-            assert result == expected
+            cover_file = tmp_path / f"cover{ext}"
+            cover_file.write_bytes(b"fake image data")
+            _, epub_writer = self._make_epub_writer()
 
-    def test_add_cover_with_image(self):
-        """测试添加封面图片"""
+            assert self.writer._add_cover(epub_writer, cover_file) == "cover-page"
+            assert {item[0]: item[2] for item in epub_writer.manifest}["cover-image"] == expected
 
-        # 创建空的book对象用于测试
-        book = epub.EpubBook()
+    def _make_epub_writer(self):
+        """创建写入内存的 EPUB 写入器"""
+        zf = zipfile.ZipFile(io.BytesIO(), "w")
+        return zf, _StreamingEpubWriter(zf, "zh-CN")
 
-        # 创建临时图片文件
-        cover_file = Path(tempfile.mktemp(suffix=".jpg"))
-        cover_file.write_bytes(b"fake jpg data")
+    def test_write_epub_structure(self, tmp_path):
+        """测试EPUB文件结构"""
+        chapter = Chapter(title='A & B <"C">', content="<p>测试内容</p>", content_type="chapter")
+        volume = Volume(title="测试卷", chapters=[chapter])
 
-        try:
-            # 调用_add_cover方法
-            self.writer._add_cover(book, cover_file)
+        output_file = tmp_path / "output.epub"
+
+        self.writer.write_epub(volumes=[volume], output=output_file, title="测试小说", author="测试作者")
+
+        with zipfile.ZipFile(output_file) as zf:
+            names = zf.namelist()
+            # mimetype 必须是第一个且不压缩
+            assert names[0] == "mimetype"
+            assert zf.getinfo("mimetype").compress_type == zipfile.ZIP_STORED
+            assert "META-INF/container.xml" in names
+            assert "EPUB/toc.ncx" in names
+            assert "EPUB/nav.xhtml" in names
+            assert zf.getinfo("EPUB/chapter_1.xhtml").compress_type == zipfile.ZIP_DEFLATED
+
+            opf = zf.read("EPUB/content.opf").decode("utf-8")
+            assert "<dc:title>测试小说</dc:title>" in opf
+            assert '<dc:creator id="creator">测试作者</dc:creator>' in opf
+            assert '<dc:identifier id="id">epuber-' in opf
+            assert opf.index('idref="nav"') < opf.index('idref="volume_0"') < opf.index('idref="chapter_1"')
+
+            page = zf.read("EPUB/chapter_1.xhtml").decode("utf-8")
+            assert "<h1>A &amp; B &lt;&quot;C&quot;&gt;</h1>" in page
+            assert "<p>测试内容</p>" in page
+
+    def test_write_epub_read_back(self, tmp_path):
+        """测试生成的EPUB可以被zipfile完整读回"""
+        volumes = [
+            Volume(
+                title=f"第{i}卷",
+                chapters=[
+                    Chapter(title=f"第{j}章", content=f"<p>{'内容' * 1000}{j}</p>", content_type="chapter")
+                    for j in range(20)
+                ],
+            )
+            for i in range(1, 3)
+        ]
+        output_file = tmp_path / "read_back.epub"
+        self.writer.write_epub(volumes=volumes, output=output_file, title="测试小说", author="测试作者")
+
+        with zipfile.ZipFile(output_file) as zf:
+            assert zf.testzip() is None
+            assert zf.namelist()[0] == "mimetype"
+            assert zf.getinfo("mimetype").compress_type == zipfile.ZIP_STORED
+            pages = [name for name in zf.namelist() if name.endswith(".xhtml") and name != "EPUB/nav.xhtml"]
+            assert len(pages) >= 40
+            for name in zf.namelist():
+                info = zf.getinfo(name)
+                assert len(zf.read(name)) == info.file_size
+            assert "内容" * 1000 in zf.read(pages[-1]).decode("utf-8")
+
+    def test_book_identifier(self):
+        """测试书籍标识符由标题和作者确定"""
+        identifier = _book_identifier("测试小说", "测试作者")
+        assert identifier == _book_identifier("测试小说", "测试作者")
+        assert identifier != _book_identifier("测试小说", "其他作者")
+        assert identifier.startswith("epuber-")
+        assert identifier.isascii()
+
+    def test_add_cover_with_image(self, tmp_path):
+        """测试添加封面图片"""
+        zf, epub_writer = self._make_epub_writer()
 
-            # 检查book是否添加了封面相关项
-            items = list(book.get_items())
-            image_items = [item for item in items if isinstance(item, epub.EpubImage)]
-            html_items = [item for item in items if isinstance(item, epub.EpubHtml) and "cover" in item.file_name]
+        # 创建临时图片文件
+        cover_file = tmp_path / "cover.jpg"
+        cover_file.write_bytes(b"fake jpg data")
 
-            assert len(image_items) == 1
-            assert len(html_items) == 1
+        # 调用_add_cover方法
+        cover_page = self.writer._add_cover(epub_writer, cover_file)
 
-        finally:
-            if cover_file.exists():
-                cover_file.unlink()
+        # 检查是否添加了封面相关项
+        assert cover_page == "cover-page"
+        assert epub_writer.cover_image_id == "cover-image"
+        assert zf.read("EPUB/cover.jpg") == b"fake jpg data"
+        # 图片已经压缩过，直接存储
+        assert zf.getinfo("EPUB/cover.jpg").compress_type == zipfile.ZIP_STORED
+        assert "EPUB/cover.xhtml" in zf.namelist()
+        # 封面图片只写入一次
+        assert zf.namelist().count("EPUB/cover.jpg") == 1
+        assert [item[0] for item in epub_writer.manifest].count("cover-image") == 1
 
     def test_add_cover_nonexistent_image(self):
         """测试添加不存在的封面图片"""
-
-        book = epub.EpubBook()
+        _, epub_writer = self._make_epub_writer()
         nonexistent_cover = Path("nonexistent.jpg")
 
         # 应该不会抛出异常，而是打印警告
-        self.writer._add_cover(book, nonexistent_cover)
+        assert self.writer._add_cover(epub_writer, nonexistent_cover) is None
 
         # 检查没有添加任何项
-        items = book.get_items()
-        image_items = [item for item in items if isinstance(item, epub.EpubImage)]
-        assert len(image_items) == 0
+        assert epub_writer.manifest == []
+        assert epub_writer.cover_image_id is None
 
     def test_add_default_styles(self):
         """测试添加默认样式"""
-
-        book = epub.EpubBook()
-
-        # 添加一个HTML章节
-        chapter = epub.EpubHtml(title="测试章节", file_name="chapter1.xhtml")
-        chapter.content = "<p>测试内容</p>"
-        book.add_item(chapter)
+        zf, epub_writer = self._make_epub_writer()
 
         # 调用添加样式方法
-        self.writer._add_default_styles(book)
+        self.writer._add_default_styles(epub_writer)
 
-        # 检查是否添加了样式项
-        items = book.get_items()
-        style_items = [item for item in items if item.media_type == "text/css"]
+        # 之后写入的页面应带上样式链接
+        epub_writer.add_page("chapter_0", "chapter_0.xhtml", "测试章节", "<p>测试内容</p>")
+        page = zf.read("EPUB/chapter_0.xhtml").decode("utf-8")
+        style_items = [item for item in epub_writer.manifest if item[2] == "text/css"]
 
         # 如果存在default.css文件，应该添加了样式
         css_path = self.writer.template_dir / "default.css"
         if css_path.exists():
             assert len(style_items) == 1
-            # 检查HTML章节是否有样式链接
-            assert "style/default.css" in chapter.content or hasattr(chapter, "links")
+            assert "style/default.css" in page
         else:
             # 如果没有样式文件，不应该添加样式项
             assert len(style_items) == 0
+            assert "style/default.css" not in page
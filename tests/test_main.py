@@ -2,148 +2,109 @@
 测试主入口模块
 """
 
-import shutil
 from pathlib import Path
+from typing import List, Optional
 
 import pytest
-from typer.testing import CliRunner
 
-from main import app
+# 检查是否安装了lxml（只在导入模块时检查一次）
+try:
+    import lxml  # noqa: F401
+
+    HAS_LXML = True
+except ImportError:
+    HAS_LXML = False
+
+
+# 测试小说内容：两个带正文的章节即可覆盖完整的生成流程
+TEST_NOVEL = "第一章 测试章节\n内容一\n第二章 另一个章节\n内容二\n".encode()
+
+
+def _generate_args(novel_path: Path, output_dir: Path, author: Optional[str] = None) -> List[str]:
+    """构建 generate 命令参数，未指定作者时使用默认作者"""
+    args = ["generate", str(novel_path), "--output", str(output_dir)]
+    if author:
+        args += ["--author", author]
+    return args
+
+
+@pytest.fixture(scope="session")
+def test_novel_path(tmp_path_factory):
+    """测试小说文件，整个测试会话只写入一次；生成的 EPUB 应输出到各测试自己的目录"""
+    novel_path = tmp_path_factory.mktemp("novels") / "test_novel.txt"
+    novel_path.write_bytes(TEST_NOVEL)
+    return novel_path
+
+
+@pytest.fixture(scope="session")
+def prebuilt_epub(tmp_path_factory, test_novel_path, runner, app):
+    """整个测试会话只生成一次的 EPUB 文件，供只需要读取 EPUB 的测试复用"""
+    build_dir = tmp_path_factory.mktemp("prebuilt_epub")
+
+    result = runner.invoke(app, _generate_args(test_novel_path, build_dir, "测试作者"), catch_exceptions=False)
+    assert result.exit_code == 0, result.output
+    return build_dir / "test_novel.epub"
 
 
 class TestMainApp:
     """测试主应用 CLI"""
 
-    def setup_method(self):
-        """测试前准备"""
-        self.runner = CliRunner()
-
-    def test_app_help(self):
+    def test_app_help(self, runner, app):
         """测试帮助信息"""
-        result = self.runner.invoke(app, ["--help"])
+        result = runner.invoke(app, ["--help"], catch_exceptions=False)
         assert result.exit_code == 0
         assert "EPUB 生成器" in result.output
 
-    def test_generate_command_help(self):
+    def test_generate_command_help(self, runner, app):
         """测试 generate 命令帮助"""
-        result = self.runner.invoke(app, ["generate", "--help"])
+        result = runner.invoke(app, ["generate", "--help"], catch_exceptions=False)
         assert result.exit_code == 0
         assert "生成 EPUB 文件" in result.output
 
-    def test_validate_command_help(self):
+    def test_validate_command_help(self, runner, app):
         """测试 validate 命令帮助"""
-        result = self.runner.invoke(app, ["validate", "--help"])
+        result = runner.invoke(app, ["validate", "--help"], catch_exceptions=False)
         assert result.exit_code == 0
         assert "验证 EPUB 文件格式" in result.output
 
-    @pytest.mark.parametrize("command", [["generate"], ["validate"]])
-    def test_commands_require_arguments(self, command):
+    @pytest.mark.parametrize("command", ["generate", "validate"])
+    def test_commands_require_arguments(self, command, runner, app):
         """测试命令需要必要的参数"""
-        result = self.runner.invoke(app, command)
+        result = runner.invoke(app, [command])
         assert result.exit_code != 0  # 应该失败因为缺少必要参数
 
+    def test_generate_invalid_regex(self, tmp_path, runner, app):
+        """测试正则表达式语法错误时给出明确提示"""
+        result = runner.invoke(app, ["generate", str(tmp_path / "novel.txt"), "--chapter-regex", "^第(\\d+章"])
+        assert result.exit_code != 0
+        assert "章节标题正则表达式语法错误" in result.output
 
+
+@pytest.mark.slow
+@pytest.mark.skipif(not HAS_LXML, reason="lxml not available, skipping integration tests")
 class TestMainIntegration:
     """集成测试"""
 
-    def setup_method(self):
-        """测试前准备"""
-        # 检查是否安装了ebooklib
-        try:
-            import ebooklib  # noqa: F401
-
-            self.has_ebooklib = True
-        except ImportError:
-            self.has_ebooklib = False
-
-        if not self.has_ebooklib:
-            pytest.skip("ebooklib not available, skipping integration tests")
-
-        self.runner = CliRunner()
-        self.temp_dir = Path("temp_test_dir")
-        self.temp_dir.mkdir(exist_ok=True)
-
-        # 创建测试小说文件
-        test_content = """第一章 测试章节
-
-这是第一章的内容。
-
-第二章 另一个章节
-
-这是第二章的内容。
-"""
-        (self.temp_dir / "test_novel.txt").write_text(test_content)
-
-    def teardown_method(self):
-        """测试后清理"""
-        if self.temp_dir.exists():
-            shutil.rmtree(self.temp_dir)
-
-    def test_generate_epub_success(self):
-        """测试成功生成 EPUB"""
+    @pytest.mark.parametrize("author", ["测试作者", None], ids=["custom_author", "default_author"])
+    def test_generate_epub_success(self, author, tmp_path, test_novel_path, runner, app):
+        """测试成功生成 EPUB（指定作者和使用默认作者）"""
         # 指定输出目录，默认会生成 test_novel.epub
-        output_file = self.temp_dir / "test_novel.epub"
-
-        result = self.runner.invoke(
-            app,
-            [
-                "generate",
-                str(self.temp_dir / "test_novel.txt"),
-                "--output",
-                str(self.temp_dir),  # 指定输出目录
-                "--author",
-                "测试作者",
-            ],
-        )
+        output_file = tmp_path / "test_novel.epub"
+
+        result = runner.invoke(app, _generate_args(test_novel_path, tmp_path, author), catch_exceptions=False)
 
         assert result.exit_code == 0
-        assert "EPUB 文件已生成" in result.output
         assert output_file.exists()
 
-    def test_validate_epub_success(self):
-        """测试验证 EPUB 成功"""
-        # 先创建一个 EPUB 文件用于测试
-        output_file = self.temp_dir / "test_novel.epub"
-        result = self.runner.invoke(
-            app,
-            [
-                "generate",
-                str(self.temp_dir / "test_novel.txt"),
-                "--output",
-                str(self.temp_dir),  # 指定输出目录
-                "--author",
-                "测试作者",
-            ],
-        )
-        assert result.exit_code == 0
+    def test_validate_epub_success(self, prebuilt_epub):
+        """测试验证 EPUB 成功（直接调用验证逻辑，CLI 参数解析由其他测试覆盖）"""
+        from epuber.generator import EpubGenerator
 
-        # 现在验证它
-        result = self.runner.invoke(app, ["validate", str(output_file)])
-        assert result.exit_code == 0
-        assert "EPUB 文件格式有效" in result.output
-
-    def test_generate_with_default_author(self):
-        """测试使用默认作者生成EPUB"""
-        output_file = self.temp_dir / "test_novel.epub"
-
-        result = self.runner.invoke(
-            app,
-            [
-                "generate",
-                str(self.temp_dir / "test_novel.txt"),
-                "--output",
-                str(self.temp_dir),  # 指定输出目录
-                # 不指定--author，使用默认值
-            ],
-        )
-
-        assert result.exit_code == 0
-        assert "EPUB 文件已生成" in result.output
-        assert output_file.exists()
+        assert EpubGenerator().validate_epub(prebuilt_epub)
 
-    def test_validate_nonexistent_file(self):
+    def test_validate_nonexistent_file(self, tmp_path, runner, app):
         """测试验证不存在的文件"""
-        nonexistent_file = self.temp_dir / "nonexistent.epub"
-        result = self.runner.invoke(app, ["validate", str(nonexistent_file)])
+        nonexistent_file = tmp_path / "nonexistent.epub"
+        result = runner.invoke(app, ["validate", str(nonexistent_file)])
         assert result.exit_code != 0
         assert "无效" in result.output